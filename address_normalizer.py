@@ -0,0 +1,282 @@
+import re
+import csv
+import sys
+import argparse
+from functools import lru_cache
+from multiprocessing import Pool
+
+# USPS Publication 28, Appendix C1: street suffix spellings -> standard abbreviation
+STANDARD_SUFFIXES = {
+    "ALY": ["ALLEY", "ALLEE", "ALLY", "ALY"],
+    "ANX": ["ANNEX", "ANEX", "ANNX", "ANX"],
+    "AVE": ["AVENUE", "AV", "AVE", "AVEN", "AVENU", "AVN", "AVNUE"],
+    "BLVD": ["BOULEVARD", "BLVD", "BOUL", "BOULV"],
+    "BND": ["BEND", "BND"],
+    "BR": ["BRANCH", "BR", "BRNCH"],
+    "BRG": ["BRIDGE", "BRDGE", "BRG"],
+    "BYP": ["BYPASS", "BYP", "BYPA", "BYPAS", "BYPS"],
+    "CIR": ["CIRCLE", "CIR", "CIRC", "CIRCL", "CRCL", "CRCLE"],
+    "CT": ["COURT", "CT"],
+    "CTS": ["COURTS", "CTS"],
+    "CV": ["COVE", "CV"],
+    "CRK": ["CREEK", "CRK"],
+    "CRES": ["CRESCENT", "CRES", "CRSENT", "CRSNT"],
+    "XING": ["CROSSING", "CRSSNG", "XING"],
+    "DR": ["DRIVE", "DR", "DRIV", "DRV"],
+    "EST": ["ESTATE", "EST"],
+    "ESTS": ["ESTATES", "ESTS"],
+    "EXPY": ["EXPRESSWAY", "EXP", "EXPR", "EXPRESS", "EXPW", "EXPY"],
+    "EXT": ["EXTENSION", "EXT", "EXTN", "EXTNSN"],
+    "FM": ["FM"],
+    "FWY": ["FREEWAY", "FREEWY", "FRWAY", "FRWY", "FWY"],
+    "GDNS": ["GARDENS", "GARDN", "GRDEN", "GRDN", "GDNS"],
+    "GLN": ["GLEN", "GLN"],
+    "GRV": ["GROVE", "GROV", "GRV"],
+    "HTS": ["HEIGHTS", "HT", "HTS"],
+    "HWY": ["HIGHWAY", "HIGHWY", "HIWAY", "HIWY", "HWAY", "HWY"],
+    "HL": ["HILL", "HL"],
+    "HLS": ["HILLS", "HLS"],
+    "HOLW": ["HOLLOW", "HLLW", "HOLLOWS", "HOLW", "HOLWS"],
+    "JCT": ["JUNCTION", "JCTION", "JCTN", "JUNCTN", "JUNCTON", "JCT"],
+    "LK": ["LAKE", "LK"],
+    "LKS": ["LAKES", "LKS"],
+    "LNDG": ["LANDING", "LNDG", "LNDNG"],
+    "LN": ["LANE", "LN"],
+    "LOOP": ["LOOP", "LOOPS"],
+    "MDW": ["MEADOW", "MDW"],
+    "MDWS": ["MEADOWS", "MDWS", "MEDOWS"],
+    "MNR": ["MANOR", "MNR"],
+    "MTN": ["MOUNTAIN", "MNTAIN", "MNTN", "MOUNTIN", "MTIN", "MTN"],
+    "OVAL": ["OVAL", "OVL"],
+    "PARK": ["PARK", "PRK"],
+    "PKWY": ["PARKWAY", "PARKWY", "PKWAY", "PKWY", "PKY"],
+    "PASS": ["PASS"],
+    "PATH": ["PATH", "PATHS"],
+    "PIKE": ["PIKE", "PIKES"],
+    "PL": ["PLACE", "PL"],
+    "PLZ": ["PLAZA", "PLZ", "PLZA"],
+    "PT": ["POINT", "PT"],
+    "PR": ["PRAIRIE", "PR", "PRR"],
+    "RNCH": ["RANCH", "RANCHES", "RNCH", "RNCHS"],
+    "RD": ["ROAD", "RD"],
+    "RDS": ["ROADS", "RDS"],
+    "RIV": ["RIVER", "RIV", "RVR", "RIVR"],
+    "ROW": ["ROW"],
+    "RUN": ["RUN"],
+    "SHR": ["SHORE", "SHOAR", "SHR"],
+    "SQ": ["SQUARE", "SQ", "SQR", "SQRE", "SQU"],
+    "ST": ["STREET", "STRT", "ST", "STR"],
+    "TER": ["TERRACE", "TER", "TERR"],
+    "TRCE": ["TRACE", "TRACES", "TRCE"],
+    "TRL": ["TRAIL", "TRAILS", "TRL", "TRLS"],
+    "TPKE": ["TURNPIKE", "TRNPK", "TURNPK", "TPKE"],
+    "VLY": ["VALLEY", "VALLY", "VLLY", "VLY"],
+    "VW": ["VIEW", "VW"],
+    "VLG": ["VILLAGE", "VILL", "VILLAG", "VILLG", "VILLIAGE", "VLG"],
+    "VIS": ["VISTA", "VIS", "VIST", "VST", "VSTA"],
+    "WALK": ["WALK", "WALKS"],
+    "WAY": ["WAY", "WY"],
+    "WLS": ["WELLS", "WLS"],
+}
+SUFFIXES = {spelling: standard for standard, spellings in STANDARD_SUFFIXES.items() for spelling in spellings}
+
+DIRECTIONALS = {
+    "N": "N", "NORTH": "N",
+    "S": "S", "SOUTH": "S",
+    "E": "E", "EAST": "E",
+    "W": "W", "WEST": "W",
+    "NE": "NE", "NORTHEAST": "NE",
+    "NW": "NW", "NORTHWEST": "NW",
+    "SE": "SE", "SOUTHEAST": "SE",
+    "SW": "SW", "SOUTHWEST": "SW",
+}
+
+# USPS Publication 28, Appendix C2: secondary unit designators
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT", "APT": "APT",
+    "BUILDING": "BLDG", "BLDG": "BLDG",
+    "LOT": "LOT",
+    "SPACE": "SPC", "SPC": "SPC",
+    "SUITE": "STE", "STE": "STE",
+    "TRAILER": "TRLR", "TRLR": "TRLR",
+    "UNIT": "UNIT",
+    "#": "#",
+}
+
+STATE_CODES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC",
+}
+
+# Route words that, followed by a number, name the street itself ("COUNTY ROAD 301", "FM 1234", "US HWY 59")
+ROUTE_WORDS = {spelling for spelling, standard in SUFFIXES.items() if standard in ("RD", "HWY", "FM")} | {"CR", "RR"}
+
+TOKEN_PATTERN = re.compile(r"#|[A-Z0-9]+(?:[-/][A-Z0-9]+)*")
+HOUSE_NUMBER_PATTERN = re.compile(r"^\d+[A-Z]?(?:-\d*[A-Z]?)?$")
+ZIP_PATTERN = re.compile(r"^\d{5}(?:-?\d{4})?$")
+ROUTE_NUMBER_PATTERN = re.compile(r"^\d+[A-Z]?$")
+# What follows a unit designator: "2", "3B", "B", "12-A"
+UNIT_ID_PATTERN = re.compile(r"^(?:[A-Z]|[A-Z]?\d+[A-Z]?(?:-[A-Z0-9]+)?)$")
+
+# Below this many addresses a process pool costs more than it saves
+POOL_THRESHOLD = 20000
+
+
+@lru_cache(maxsize=100000)
+def parse_address(address):
+    """
+    Parse a free-form address into its USPS components
+    Example: "306 N Main St Apt 2, Tuleta TX 78162" ->
+        {"number": "306", "predirectional": "N", "street_name": "MAIN", "suffix": "ST",
+         "postdirectional": "", "unit": "APT 2", "city": "TULETA", "state": "TX", "zip": "78162"}
+    The result is cached and shared - treat it as read-only.
+    """
+    street_part, _, locality_part = (address or "").upper().partition(",")
+    tokens = TOKEN_PATTERN.findall(street_part)
+    locality = TOKEN_PATTERN.findall(locality_part)
+
+    parsed = {
+        "number": "", "predirectional": "", "street_name": "", "suffix": "",
+        "postdirectional": "", "unit": "", "city": "", "state": "", "zip": "",
+    }
+
+    # House number
+    if tokens and HOUSE_NUMBER_PATTERN.match(tokens[0]):
+        parsed["number"] = tokens.pop(0)
+
+    # Unit: designator and everything after it, only when an identifier follows ("12 Old Lot Rd" has no unit)
+    for i, token in enumerate(tokens):
+        if token in UNIT_DESIGNATORS and i > 0 and i + 1 < len(tokens) and UNIT_ID_PATTERN.match(tokens[i + 1]):
+            separator = "" if token == "#" else " "
+            parsed["unit"] = (UNIT_DESIGNATORS[token] + separator + " ".join(tokens[i + 1:])).strip()
+            tokens = tokens[:i]
+            break
+
+    # Predirectional, only when a street name follows ("N ST" is a street named N)
+    if len(tokens) > 1 and tokens[0] in DIRECTIONALS and tokens[1] not in SUFFIXES:
+        parsed["predirectional"] = DIRECTIONALS[tokens.pop(0)]
+
+    # Suffix: the last suffix word that has a street name before it; words after it are
+    # a postdirectional and/or the city when the user left out the comma ("306 Main St Tuleta")
+    # A numbered route has no suffix: the route word and number are part of the street name
+    route_at = None
+    for i in range(len(tokens) - 1):
+        if tokens[i] in ROUTE_WORDS and ROUTE_NUMBER_PATTERN.match(tokens[i + 1]):
+            route_at = i
+            break
+
+    suffix_at = None
+    if route_at is None:
+        for i in range(len(tokens) - 1, 0, -1):
+            if tokens[i] in SUFFIXES:
+                suffix_at = i
+                break
+
+    if route_at is not None or suffix_at is not None:
+        if route_at is not None:
+            trailing = tokens[route_at + 2:]
+            tokens = tokens[:route_at + 2]
+        else:
+            parsed["suffix"] = SUFFIXES[tokens[suffix_at]]
+            trailing = tokens[suffix_at + 1:]
+            tokens = tokens[:suffix_at]
+        if trailing and trailing[0] in DIRECTIONALS:
+            parsed["postdirectional"] = DIRECTIONALS[trailing.pop(0)]
+        locality = trailing + locality
+    elif len(tokens) > 1 and tokens[-1] in DIRECTIONALS:
+        parsed["postdirectional"] = DIRECTIONALS[tokens.pop()]
+
+    parsed["street_name"] = " ".join(tokens)
+
+    # Locality: "<city words> [state] [zip]"
+    if locality and ZIP_PATTERN.match(locality[-1]):
+        parsed["zip"] = locality.pop()
+    if locality and locality[-1] in STATE_CODES and len(locality) > 1:
+        parsed["state"] = locality.pop()
+    parsed["city"] = " ".join(locality)
+
+    return parsed
+
+
+def street_key(address):
+    """Cache/index key for the part users type: house number, predirectional and street name ("306 MAIN")"""
+    parsed = parse_address(address)
+    return " ".join(filter(None, [parsed["number"], parsed["predirectional"], parsed["street_name"]]))
+
+
+def canonical_key(address):
+    """Canonical street line with USPS abbreviations ("306 N MAIN ST APT 2")"""
+    parsed = parse_address(address)
+    return " ".join(filter(None, [
+        parsed["number"], parsed["predirectional"], parsed["street_name"],
+        parsed["suffix"], parsed["postdirectional"], parsed["unit"]
+    ]))
+
+
+def full_key(address):
+    """Canonical street line followed by the city ("306 MAIN ST TULETA")"""
+    return " ".join(filter(None, [canonical_key(address), parse_address(address)["city"]]))
+
+
+def search_form_values(address):
+    """Exact values to type into a CAD "search by address" form"""
+    parsed = parse_address(address)
+    return {
+        "street_number": parsed["number"],
+        "street_name": " ".join(filter(None, [parsed["predirectional"], parsed["street_name"]])),
+        "city": parsed["city"],
+    }
+
+
+def _normalize_row(address):
+    parsed = parse_address(address)
+    return {**parsed, "street_key": street_key(address), "canonical_key": canonical_key(address)}
+
+
+def normalize_batch(addresses, processes=None):
+    """
+    Normalize many addresses at once
+    Duplicates are parsed once, and large batches are spread over a process pool.
+    Returns one dict per input address, in order.
+    """
+    unique_addresses = list(dict.fromkeys(addresses))
+
+    if len(unique_addresses) >= POOL_THRESHOLD and processes != 1:
+        with Pool(processes) as pool:
+            rows = pool.map(_normalize_row, unique_addresses, chunksize=2000)
+    else:
+        rows = [_normalize_row(address) for address in unique_addresses]
+
+    by_address = dict(zip(unique_addresses, rows))
+    return [by_address[address] for address in addresses]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize the address column of a CSV batch file")
+    parser.add_argument("input", help="Input CSV file")
+    parser.add_argument("output", help="Output CSV file (input columns plus parsed address fields)")
+    parser.add_argument("--column", default="address", help="Name of the address column")
+    parser.add_argument("--processes", type=int, help="Worker processes for large files")
+    args = parser.parse_args()
+
+    with open(args.input, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+
+    normalized = normalize_batch([row.get(args.column, "") for row in rows], args.processes)
+    extra_columns = list(normalized[0].keys()) if normalized else []
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames + extra_columns)
+        writer.writeheader()
+        for row, fields in zip(rows, normalized):
+            writer.writerow({**row, **fields})
+
+    print(f"✅ Normalized {len(rows)} addresses into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import re
+
+# APN formats that parse_apn_result accepts
+APN_FORMATS = [
+    r"\d{5}-\d{5}-\d{5}-\d{6}",
+    r"\d{21}",
+]
+
+# Labels CAD detail pages put next to the APN
+APN_LABELS = [
+    "Geographic ID",
+    "APN",
+    "Parcel Number",
+]
+
+# How far (in characters of page text) the APN may sit from its label
+LABEL_DISTANCE = 80
+
+
+class APNWatcher:
+    """Stops an agent as soon as a confident APN is rendered on the current page"""
+
+    def __init__(self, capture_screenshot=False):
+        self.capture_screenshot = capture_screenshot
+        self.apn = None
+        self.detail_url = None
+        self.page_text = None
+        self.page_html = None
+        self.screenshot = None
+        self.found_at_step = None
+
+    async def on_step_end(self, agent):
+        """on_step_end hook for Agent.run(): scan the page DOM after every agent step"""
+        if self.apn:
+            return
+
+        try:
+            page = await agent.browser_session.get_current_page()
+            page_text = await page.inner_text("body")
+        except Exception as e:
+            print(f"APN watcher could not read page: {e}")
+            return
+
+        apn = self.find_apn(page_text)
+        if apn:
+            self.apn = apn
+            self.detail_url = page.url
+            self.page_text = page_text
+            # Snapshot the detail page once so its other fields can be read without revisiting it
+            try:
+                self.page_html = await page.content()
+            except Exception as e:
+                print(f"APN watcher could not snapshot page HTML: {e}")
+            if self.capture_screenshot:
+                try:
+                    self.screenshot = await page.screenshot(full_page=True)
+                except Exception as e:
+                    print(f"APN watcher could not take screenshot: {e}")
+            self.found_at_step = agent.state.n_steps
+            print(f"APN {apn} found on {page.url} - stopping agent early")
+            agent.stop()
+
+    def find_apn(self, page_text):
+        """Return the APN if the page shows exactly one, next to one of the APN labels"""
+        # A search-results table lists many IDs; a detail page shows exactly one
+        candidates = set()
+        for apn_format in APN_FORMATS:
+            candidates.update(re.findall(rf"(?<![\d-]){apn_format}(?![\d-])", page_text))
+        if len(candidates) != 1:
+            return None
+
+        apn = candidates.pop()
+        for label in APN_LABELS:
+            labeled_pattern = rf"\b{re.escape(label)}\b[^\d]{{0,{LABEL_DISTANCE}}}{re.escape(apn)}"
+            if re.search(labeled_pattern, page_text, re.IGNORECASE):
+                return apn
+        return None
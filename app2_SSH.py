@@ -6,9 +6,6 @@ import time
 import subprocess
 import json
 import re
-import sys
-import threading
-from io import StringIO
 from datetime import datetime
 from dotenv import load_dotenv
 load_dotenv()
@@ -16,6 +13,12 @@ load_dotenv()
 from browser_use import Agent, BrowserSession
 from langchain_openai import ChatOpenAI
 
+from address_normalizer import search_form_values
+from log_capture import LogRing, current_log_ring, install_stdout_router
+from live_output import LiveOutput, LIVE_OUTPUT_MAX_LINES
+from background_tasks import BackgroundUpdater, active_updater_count
+from conversation_logs import ConversationLogSink, new_search_id, start_sweeper
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="APN Lookup Tool", 
@@ -24,41 +27,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Create a simple pipe to capture output
-class OutputCapture:
-    def __init__(self):
-        self.output = []
-        self.lock = threading.Lock()
-        
-    def write(self, text):
-        with self.lock:
-            self.output.append(text)
-            # Keep only the last 1000 lines to avoid memory issues
-            if len(self.output) > 1000:
-                self.output = self.output[-1000:]
-        # Also write to the original stdout so we can see in terminal
-        original_stdout.write(text)
-        
-    def get_output(self):
-        with self.lock:
-            return "".join(self.output)
-    
-    def clear(self):
-        with self.lock:
-            self.output = []
-    
-    def flush(self):
-        # Required for stdout compatibility
-        pass
-
-# Global output capture
-output_capture = OutputCapture()
-
-# Store the original stdout
-original_stdout = sys.stdout
-
-# Redirect stdout to our capture
-sys.stdout = output_capture
+# Copy printed output into the running search's log ring (per Streamlit session)
+install_stdout_router()
 
 class APNSearcher:
     """APN search class that wraps the browser automation logic"""
@@ -86,17 +56,20 @@ class APNSearcher:
         except Exception as e:
             return f"⚠️ Profile cleanup warning: {e}"
 
-    async def search_apn(self, address, county, state="TX", output_area=None):
+    async def search_apn(self, address, county, state="TX", live_output=None, log_ring=None):
         """
         Main APN search function
         Args:
             address: Property address (e.g., "306 Main St, Tuleta")
             county: County name (e.g., "Bee")
             state: State abbreviation (e.g., "TX")
-            output_area: Streamlit container for displaying output
+            live_output: LiveOutput that shows the search's output as it is printed
+            log_ring: LogRing that receives this search's printed output
         """
-        # Clear previous output
-        output_capture.clear()
+        # Start this session's log from scratch and route this search's prints into it
+        log_ring = log_ring or LogRing()
+        log_ring.clear()
+        current_log_ring.set(log_ring)
         
         # Print some initial info that will be captured
         print(f"Starting APN search for {address} in {county}, {state}")
@@ -113,10 +86,14 @@ class APNSearcher:
         # Create logs directory if it doesn't exist
         os.makedirs("logs", exist_ok=True)
         
-        # Parse address components
-        address_parts = address.split()
-        street_number = address_parts[0] if address_parts else "306"
-        street_name = " ".join(address_parts[1:]).replace("St,", "").replace("St", "").strip() if len(address_parts) > 1 else "Main"
+        # Every log, profile and screenshot of this lookup is filed under one unique id
+        search_id = new_search_id()
+        conversation_logs = ConversationLogSink()
+        
+        # Parse address components into the values the CAD search form expects
+        form_values = search_form_values(address)
+        street_number = form_values["street_number"]
+        street_name = form_values["street_name"]
         
         # Create dynamic task based on inputs - FOCUSED ON APN
         task = f"""
@@ -137,36 +114,35 @@ class APNSearcher:
         Step 7: click the row with address matching {address} to view details and confirm the APN number is visible
         """
         
-        # Start a thread to update the output area
+        # Update the output area with the lines printed since the last tick, for as long as this search runs
         def update_output():
-            while True:
-                if output_area:
-                    with output_area:
-                        st.code(output_capture.get_output())
-                time.sleep(0.5)
-        
-        update_thread = threading.Thread(target=update_output, daemon=True)
-        update_thread.start()
-        
-        # Create a unique browser session with custom profile
-        unique_profile = f"profile_{int(time.time())}"
-        browser_session = BrowserSession(
-            browser_type="chromium",
-            user_data_dir=f"~/.config/browseruse/profiles/{unique_profile}",
-            keep_alive=False,
-            headless=headless
-        )
+            if live_output:
+                live_output.update_from_ring(log_ring)
         
-        # Create an agent with detailed configuration
-        agent = Agent(
-            task=task,
-            llm=self.llm,
-            browser_session=browser_session,
-            use_vision=True,
-            save_conversation_path=f"logs/apn_search_{int(time.time())}"
-        )
+        output_updater = BackgroundUpdater(update_output, interval=0.5, name="apn_search_output")
+        unique_profile = f"profile_{search_id}"
         
         try:
+            # Started inside the try so the finally below stops it even if the session or agent fails to build
+            output_updater.start()
+            
+            # Create a unique browser session with custom profile
+            browser_session = BrowserSession(
+                browser_type="chromium",
+                user_data_dir=f"~/.config/browseruse/profiles/{unique_profile}",
+                keep_alive=False,
+                headless=headless
+            )
+            
+            # Create an agent with detailed configuration
+            agent = Agent(
+                task=task,
+                llm=self.llm,
+                browser_session=browser_session,
+                use_vision=True,
+                save_conversation_path=conversation_logs.path_for(search_id, "apn_search")
+            )
+            
             # Add retry logic
             max_retries = 3
             result = None
@@ -187,6 +163,7 @@ class APNSearcher:
             
             # Parse the result to extract structured data
             parsed_result = self.parse_apn_result(str(result), address)
+            parsed_result["search_id"] = search_id
             
             return {
                 "success": True,
@@ -212,6 +189,17 @@ class APNSearcher:
                     print(f"Cleaned up profile: {unique_profile}")
             except Exception as e:
                 print(f"Profile cleanup error: {str(e)}")
+            
+            # Compress this search's conversation files and index them under its id
+            try:
+                conversation_logs.close(search_id, "apn_search")
+            except Exception as e:
+                print(f"Conversation log compression error: {str(e)}")
+            
+            # The search is over - show its last lines and stop updating the output area
+            output_updater.stop()
+            if live_output:
+                live_output.flush()
 
     def parse_apn_result(self, result_text, original_address):
         """Parse the search result to extract APN and property data"""
@@ -329,6 +317,9 @@ def load_search_history():
         return []
 
 def main():
+    # Keep logs/conversations within its size/age budget for as long as the server runs
+    start_sweeper()
+    
     st.title("🏠 Corporate APN Lookup Tool")
     st.markdown("### AI-Powered Property APN (Assessor's Parcel Number) Search")
     
@@ -359,6 +350,17 @@ def main():
     st.sidebar.markdown("---")
     st.sidebar.subheader("⚙️ Advanced Options")
     
+    live_output_lines = st.sidebar.number_input(
+        "📜 Live Output Lines",
+        min_value=50,
+        max_value=5000,
+        value=LIVE_OUTPUT_MAX_LINES,
+        step=50,
+        help="How many lines of live agent output stay on screen"
+    )
+    
+    st.sidebar.caption(f"🧵 Active output updaters: {active_updater_count()}")
+    
     show_debug = st.sidebar.checkbox(
         "🐛 Show Debug Info", 
         value=False,
@@ -379,7 +381,7 @@ def main():
                 
                 # Create a container for live output
                 st.markdown("### 🖥️ Live Browser Automation Progress")
-                output_area = st.empty()
+                output_area = st.container()
                 
                 with st.spinner("🤖 AI Agent is searching for APN..."):
                     try:
@@ -390,12 +392,17 @@ def main():
                         # Run the APN search
                         searcher = APNSearcher()
                         
+                        # Each browser session keeps its own log, so concurrent users never see each other's output
+                        if "log_ring" not in st.session_state:
+                            st.session_state.log_ring = LogRing()
+                        
                         result = asyncio.run(
                             searcher.search_apn(
                                 address, 
                                 county, 
                                 state, 
-                                output_area=output_area
+                                live_output=LiveOutput(output_area, max_lines=live_output_lines),
+                                log_ring=st.session_state.log_ring
                             )
                         )
                         
@@ -13,6 +13,25 @@ load_dotenv()
 from browser_use import Agent, BrowserSession
 from langchain_openai import ChatOpenAI
 
+from vision_policy import VisionPolicy
+from image_pipeline import ScreenshotPipeline
+from apn_watcher import APNWatcher
+from detail_extractor import extract_detail_fields, extract_label_values
+from parcel_index import ParcelIndex
+from address_normalizer import search_form_values
+from fuzzy_address import get_matcher
+from search_harvest import SearchResultsHarvester
+from url_templates import DetailUrlTemplates, refresh_parcel
+from snapshot_store import SnapshotStore
+from http_cache import install_http_cache
+from request_blocker import RequestBlocker
+from domain_state import DomainStorageState
+from search_stream import SEARCH_STAGES, drain_events, verification_events
+from screenshot_store import ScreenshotStore
+from history_memory import HistoryMemoryPolicy
+from raw_result import RawResultHandle, write_raw_result
+from conversation_logs import ConversationLogSink, new_search_id, start_sweeper
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="APN Lookup Tool", 
@@ -47,7 +66,7 @@ class APNSearcher:
         except Exception as e:
             return f"⚠️ Profile cleanup warning: {e}"
 
-    async def search_apn(self, address, county, state="TX", headless=True, verification_prompt=None):
+    async def search_apn(self, address, county, state="TX", headless=True, verification_prompt=None, keep_screenshot=False):
         """
         Main APN search function
         Args:
@@ -56,8 +75,39 @@ class APNSearcher:
             state: State abbreviation (e.g., "TX")
             headless: Run browser in headless mode (defaults to True)
             verification_prompt: Optional text to verify against property data
+        Returns the final result of search_apn_stream()
+        """
+        result = None
+        async for event in self.search_apn_stream(address, county, state, headless, verification_prompt, keep_screenshot):
+            if event["stage"] == "done":
+                result = event["result"]
+        return result
+
+    async def search_apn_stream(self, address, county, state="TX", headless=True, verification_prompt=None, keep_screenshot=False):
+        """
+        APN search as a stream of partial results, so callers can show each stage as soon as it completes
+        Yields {"stage": ..., "data": {...}} for each stage in SEARCH_STAGES that is reached,
+        then {"stage": "done", "result": {...}} with the same dict search_apn() returns.
         """
         
+        # Answer from the local parcel index / result cache when the address is known; the agent only runs on a miss
+        # The index is only a cache: a missing/locked database or a failed match check means a browser run, not a failure
+        try:
+            indexed_result = await self.search_parcel_index(address, county, verification_prompt)
+        except Exception as e:
+            print(f"Parcel index lookup failed, falling back to the agent: {e}")
+            indexed_result = None
+        if indexed_result:
+            for event in verification_events(indexed_result, include_apn=True):
+                yield event
+            yield {"stage": "done", "result": {
+                "success": True,
+                "data": indexed_result,
+                "cleanup_messages": [],
+                "raw_result": "Answered from local parcel index"
+            }}
+            return
+        
         # Clean up any existing browser conflicts
         cleanup_msg1 = self.cleanup_browser_processes()
         cleanup_msg2 = self.cleanup_browser_profile()
@@ -65,10 +115,14 @@ class APNSearcher:
         # Create logs directory if it doesn't exist
         os.makedirs("logs", exist_ok=True)
         
-        # Parse address components
-        address_parts = address.split()
-        street_number = address_parts[0] if address_parts else "306"
-        street_name = " ".join(address_parts[1:]).replace("St,", "").replace("St", "").strip() if len(address_parts) > 1 else "Main"
+        # Every log, profile and screenshot of this lookup is filed under one unique id
+        search_id = new_search_id()
+        conversation_logs = ConversationLogSink()
+        
+        # Parse address components into the values the CAD search form expects
+        form_values = search_form_values(address)
+        street_number = form_values["street_number"]
+        street_name = form_values["street_name"]
         
         # Create dynamic task for APN search
         apn_search_task = f"""
@@ -89,9 +143,11 @@ class APNSearcher:
         Step 7: click the row with address matching {address} to view details and confirm the APN number is visible
         """
         
+        unique_profile = f"profile_{search_id}"
+        shared_session = None
+        http_cache = None
         try:
             # Create a shared browser session
-            unique_profile = f"profile_{int(time.time())}"
             shared_session = BrowserSession(
                 browser_type="chromium",
                 user_data_dir=f"~/.config/browseruse/profiles/{unique_profile}",
@@ -100,55 +156,158 @@ class APNSearcher:
             )
             await shared_session.start()  # Start session manually
             
+            # Serve netronline/CAD assets from the shared on-disk cache (or a HAR file) instead of a cold profile
+            http_cache = await install_http_cache(shared_session.browser_context)
+            
+            # Drop analytics, ads, fonts and media before they load - the agent only needs the DOM
+            request_blocker = RequestBlocker()
+            await request_blocker.install(shared_session)
+            
+            # Start with the cookies/localStorage of earlier successful runs so disclaimers and banners stay dismissed
+            domain_state = DomainStorageState()
+            seeded_state = await domain_state.seed(shared_session.browser_context)
+            
+            # Both agents start on DOM text only; screenshots are sent only when they get stuck
+            vision_policy = VisionPolicy(county)
+            
+            # Screenshots that do get sent are cropped, downscaled and deduplicated first
+            image_pipeline = ScreenshotPipeline()
+            image_pipeline.install(shared_session, should_process=lambda: vision_policy.vision_active)
+            
+            # Both agents' histories live until the session ends - keep only recent screenshots in memory
+            history_memory = HistoryMemoryPolicy(search_id)
+            
             # Agent 1: Find APN
             agent1 = Agent(
                 task=apn_search_task,
                 llm=self.llm,
                 browser_session=shared_session,
-                use_vision=True,
-                save_conversation_path=f"logs/apn_search_{int(time.time())}"
+                use_vision=False,
+                save_conversation_path=conversation_logs.path_for(search_id, "apn_search")
             )
-            apn_result = await agent1.run()
+            # Stop Agent 1 as soon as the APN is rendered instead of waiting for its extra steps,
+            # and keep every search-results row it passes for later lookups of nearby addresses
+            apn_watcher = APNWatcher(capture_screenshot=keep_screenshot)
+            search_harvester = SearchResultsHarvester(county)
             
-            # Parse initial results
-            initial_parsed_result = self.parse_apn_result(str(apn_result), address)
+            # The step hooks report stages reached mid-run through this queue
+            events = asyncio.Queue()
+            county_site = {}
             
-            # Only run verification if we found an APN and have a verification prompt
-            if initial_parsed_result.get("apn_number") != "APN not found - check raw result" and verification_prompt:
-                # Extract the property details URL from agent1's history
-                property_urls = apn_result.urls()
-                property_detail_url = property_urls[-1] if property_urls else None
-                
-                # Agent 2: Verify information with direct URL navigation
-                verification_task = f"""
-                Navigate directly to this URL: {property_detail_url}
-                
-                Your ONLY task is to extract the EXACT text from the Legal Description field.
+            async def on_apn_step_end(agent):
+                await search_harvester.on_step_end(agent)
+                await apn_watcher.on_step_end(agent)
                 
-                1. Find the field labeled "Legal Description" on the page
-                2. Extract the COMPLETE TEXT VALUE from this field
-                3. Report ONLY the exact text you found, using this format:
-                   "Legal Description: [exact text]"
+                # Leaving netronline means the agent has found the county's appraisal district site
+                current_url = agent.state.history.history[-1].state.url if agent.state.history.history else ""
+                if not county_site and current_url.startswith("http") and "netronline.com" not in current_url:
+                    county_site["url"] = current_url
+                    events.put_nowait({"stage": "county_resolved", "data": {"county": county, "url": current_url}})
+                if apn_watcher.apn and not county_site.get("detail_url"):
+                    county_site["detail_url"] = apn_watcher.detail_url
+                    events.put_nowait({"stage": "detail_url", "data": {"detail_url": apn_watcher.detail_url}})
                 
-                DO NOT use phrases like "field contains" or "I found" - extract and report the ACTUAL TEXT VALUE.
+                await history_memory.on_step_end(agent, "apn_search")
+            
+            agent1_task = asyncio.create_task(agent1.run(
+                on_step_start=vision_policy.hook("apn_search"),
+                on_step_end=on_apn_step_end
+            ))
+            async for event in drain_events(events, agent1_task):
+                yield event
+            apn_result = agent1_task.result()
+            
+            # Parse initial results
+            detail_fields = {}
+            if apn_watcher.apn:
+                # The agent was stopped early, so the page text holds the details rather than its final answer
+                initial_parsed_result = self.parse_apn_result(apn_watcher.page_text, address)
+                initial_parsed_result["apn_number"] = apn_watcher.apn
+                initial_parsed_result["search_status"] = "SUCCESS"
+                initial_parsed_result["detail_url"] = apn_watcher.detail_url
                 
-                Example of correct response:
-                "Legal Description: TULETA BLK 3 LOTS 5 & 6"
+                # Read the other fields from the same detail-page snapshot instead of visiting it again;
+                # the label -> value map is exact, so it replaces the regex guesses on the page text
+                detail_fields = extract_detail_fields(html=apn_watcher.page_html, page_text=apn_watcher.page_text)
+                initial_parsed_result["owner"] = detail_fields.get("owner", "Not found")
+                initial_parsed_result["appraised_value"] = detail_fields.get("appraised_value", "Not found")
                 
-                This is the ONLY information you need to extract. Do not extract any other fields.
-                """
+                # Learn this CAD's detail URL pattern so known APNs can later be refreshed with one request
+                if apn_watcher.page_html:
+                    try:
+                        detail_labels = extract_label_values(apn_watcher.page_html)
+                        DetailUrlTemplates().learn(county, apn_watcher.detail_url, {
+                            "prop_id": detail_labels.get("Property ID"),
+                            "owner_id": detail_labels.get("Owner ID"),
+                            "apn": apn_watcher.apn
+                        })
+                    except Exception as e:
+                        print(f"Failed to learn detail URL template: {e}")
+                    
+                    # Keep the raw page so improved parsers can be rerun later without browsing again
+                    try:
+                        initial_parsed_result["snapshot"] = SnapshotStore().save(
+                            apn_watcher.page_html,
+                            url=apn_watcher.detail_url,
+                            county=county,
+                            apn=apn_watcher.apn,
+                            address=address,
+                            screenshot=apn_watcher.screenshot
+                        )
+                    except Exception as e:
+                        print(f"Failed to store detail-page snapshot: {e}")
+            else:
+                initial_parsed_result = self.parse_apn_result(str(apn_result), address)
+            
+            # The APN is the answer most callers need - hand it out before verification starts
+            if initial_parsed_result.get("search_status") == "SUCCESS":
+                yield {"stage": "apn_found", "data": dict(initial_parsed_result, county=county)}
+            
+            # Only run verification if we found an APN and have a verification prompt
+            if initial_parsed_result.get("apn_number") != "APN not found - check raw result" and verification_prompt:
+                legal_description = detail_fields.get("legal_description", "")
                 
-                agent2 = Agent(
-                    task=verification_task,
-                    llm=self.llm,
-                    browser_session=shared_session,  # Re-use the same session
-                    use_vision=True,
-                    save_conversation_path=f"logs/verification_{int(time.time())}"
-                )
-                verification_result = await agent2.run()
+                # Fall back to a second agent only when the snapshot has no legal description
+                if not legal_description:
+                    # Use the page the watcher saw the APN on, else the last URL in agent1's history
+                    property_urls = apn_result.urls()
+                    property_detail_url = apn_watcher.detail_url or (property_urls[-1] if property_urls else None)
+                    
+                    # Agent 2: Verify information with direct URL navigation
+                    verification_task = f"""
+                    Navigate directly to this URL: {property_detail_url}
+                    
+                    Your ONLY task is to extract the EXACT text from the Legal Description field.
+                    
+                    1. Find the field labeled "Legal Description" on the page
+                    2. Extract the COMPLETE TEXT VALUE from this field
+                    3. Report ONLY the exact text you found, using this format:
+                       "Legal Description: [exact text]"
+                    
+                    DO NOT use phrases like "field contains" or "I found" - extract and report the ACTUAL TEXT VALUE.
+                    
+                    Example of correct response:
+                    "Legal Description: TULETA BLK 3 LOTS 5 & 6"
+                    
+                    This is the ONLY information you need to extract. Do not extract any other fields.
+                    """
+                    
+                    agent2 = Agent(
+                        task=verification_task,
+                        llm=self.llm,
+                        browser_session=shared_session,  # Re-use the same session
+                        use_vision=False,
+                        save_conversation_path=conversation_logs.path_for(search_id, "verification")
+                    )
+                    verification_result = await agent2.run(
+                        on_step_start=vision_policy.hook("verification"),
+                        on_step_end=history_memory.hook("verification")
+                    )
+                    
+                    # Parse verification results
+                    legal_description = self.parse_legal_description(str(verification_result))
                 
-                # Parse verification results
-                legal_description = self.parse_legal_description(str(verification_result))
+                yield {"stage": "legal_description", "data": {"verification_info": legal_description or "Not found"}}
                 
                 # Check for semantic match using LLM
                 is_semantic_match = False
@@ -162,29 +321,79 @@ class APNSearcher:
                 initial_parsed_result["verification_info"] = legal_description if legal_description else "Not found"
                 initial_parsed_result["verification_prompt"] = verification_prompt
                 initial_parsed_result["is_semantic_match"] = is_semantic_match
+                yield {"stage": "match_verdict", "data": {
+                    "verification_prompt": verification_prompt,
+                    "is_semantic_match": is_semantic_match
+                }}
             elif verification_prompt:
                 # If we have a verification prompt but no APN, add placeholder verification info
                 initial_parsed_result["verification_info"] = "Not found - APN search failed"
                 initial_parsed_result["verification_prompt"] = verification_prompt
             
-            # Close the shared session
-            await shared_session.close()
+            initial_parsed_result["county"] = county
+            initial_parsed_result["search_id"] = search_id
+            initial_parsed_result["rows_harvested"] = search_harvester.rows_harvested
+            
+            # Record which steps actually needed a screenshot for this county
+            initial_parsed_result["vision_usage"] = vision_policy.summary()
+            initial_parsed_result["image_pipeline"] = image_pipeline.stats()
+            initial_parsed_result["request_blocking"] = request_blocker.stats()
+            initial_parsed_result["history_memory"] = history_memory.stats()
+            
+            # Keep the agents' screenshots for audit; frames of an unchanged page only reference the previous one
+            try:
+                frames = history_memory.frames(agent1, "apn_search")
+                if 'agent2' in locals():
+                    frames += history_memory.frames(agent2, "verification")
+                initial_parsed_result["screenshots"] = await asyncio.to_thread(
+                    ScreenshotStore().save_lookup, search_id, frames
+                )
+            except Exception as e:
+                print(f"Failed to store agent screenshots: {e}")
+            initial_parsed_result["seeded_state"] = seeded_state
+            if initial_parsed_result.get("search_status") == "SUCCESS":
+                try:
+                    await domain_state.save(shared_session.browser_context)
+                except Exception as e:
+                    print(f"Failed to save domain storage state: {e}")
+            if http_cache:
+                initial_parsed_result["http_cache"] = http_cache.stats()
+            vision_policy.save_usage()
             
-            return {
+            # Stream the agent transcripts to a compressed side file; the result only carries a handle to it
+            try:
+                raw_result = write_raw_result([
+                    ("APN SEARCH", apn_result),
+                    ("VERIFICATION", verification_result if 'verification_result' in locals() else None)
+                ], name="apn_search")
+            except Exception as e:
+                raw_result = f"Raw result not saved: {e}"
+            
+            yield {"stage": "done", "result": {
                 "success": True,
                 "data": initial_parsed_result,
                 "cleanup_messages": [cleanup_msg1, cleanup_msg2],
-                "raw_result": str(apn_result) + (f"\n\nVERIFICATION:\n{str(verification_result)}" if 'verification_result' in locals() else "")
-            }
+                "raw_result": raw_result
+            }}
             
         except Exception as e:
-            return {
+            yield {"stage": "done", "result": {
                 "success": False,
                 "error": str(e),
                 "cleanup_messages": [cleanup_msg1, cleanup_msg2]
-            }
+            }}
         
         finally:
+            # Close the shared session - close() leaves a keep_alive browser running, and a HAR is only written on context close.
+            # The cache is closed after it, since the page can still make requests through its route until then
+            if shared_session is not None:
+                try:
+                    await shared_session.kill()
+                except Exception as e:
+                    print(f"Failed to close browser session: {e}")
+            if http_cache:
+                http_cache.close()
+            
             # Clean up the unique profile after execution
             try:
                 profile_path = os.path.expanduser(f"~/.config/browseruse/profiles/{unique_profile}")
@@ -192,6 +401,103 @@ class APNSearcher:
                     shutil.rmtree(profile_path)
             except Exception as e:
                 pass
+            
+            # Compress and index whatever the agents wrote, also when they failed, so the sweeper can age it out
+            for agent_name in ("apn_search", "verification"):
+                try:
+                    await asyncio.to_thread(conversation_logs.close, search_id, agent_name)
+                except Exception as e:
+                    print(f"Conversation log compression error: {e}")
+
+    async def search_parcel_index(self, address, county, verification_prompt=None):
+        """Look the address up in the local parcel index, then fuzzily in all known addresses; None on a miss"""
+        parcels = []
+        parcel_index = ParcelIndex.open_existing()
+        if parcel_index is not None:
+            try:
+                parcels = parcel_index.lookup_address(address, county)
+            finally:
+                parcel_index.close()
+        
+        # Several parcels on one street key is ambiguous - let the agent compare them
+        if len(parcels) > 1:
+            return None
+        
+        if parcels:
+            parcel = {**parcels[0], "origin": "parcel_index"}
+            match_score = 1.0
+        else:
+            # Near-miss input ("306 Main" vs "306 MAIN ST TULETA"): accept only a clear winner
+            match = get_matcher(county).resolve(address)
+            if match is None:
+                return None
+            parcel = match["entry"]
+            match_score = match["score"]
+        
+        if parcel["origin"] == "result_cache":
+            # A lookup cached without a prompt never read the legal description - verification needs the agents
+            if verification_prompt and parcel.get("verification_info", "Not found").startswith("Not found"):
+                return None
+
+            # A previous successful lookup already has the result fields
+            result = {
+                "address": address,
+                "apn_number": parcel["apn_number"],
+                "owner": parcel.get("owner", "Not found"),
+                "appraised_value": parcel.get("appraised_value", "Not found"),
+                "search_status": "SUCCESS",
+                "source": "result_cache"
+            }
+        else:
+            result = {
+                "address": address,
+                "apn_number": parcel["apn"],
+                "owner": parcel["owner_name"] or "Not found",
+                "appraised_value": parcel["appraised_value"] or "Not found",
+                "search_status": "SUCCESS",
+                "source": "parcel_index"
+            }
+        result["search_timestamp"] = datetime.now().isoformat()
+        result["county"] = county
+        result["address_match_score"] = match_score
+        
+        # Harvested rows have no appraised value or legal description - re-read the detail page with one direct request
+        missing_fields = not parcel.get("owner_name") or not parcel.get("appraised_value") or (
+            verification_prompt and not parcel.get("legal_description")
+        )
+        if parcel["origin"] == "parcel_index" and missing_fields:
+            fields = await asyncio.to_thread(refresh_parcel, parcel, county)
+            if fields:
+                parcel_index = ParcelIndex()
+                try:
+                    parcel_index.update_fields(county, parcel["apn"], fields)
+                finally:
+                    parcel_index.close()
+                parcel["legal_description"] = fields.get("legal_description")
+                result["owner"] = fields.get("owner") or result["owner"]
+                result["appraised_value"] = fields.get("appraised_value") or result["appraised_value"]
+                result["detail_url"] = fields["detail_url"]
+
+        # The agent returns owner and value, so a hit that still lacks them is worse than a browser run
+        if "Not found" in (result["owner"], result["appraised_value"]):
+            return None
+
+        # Nothing to verify against is not a mismatch - let the agents read the legal description instead
+        if verification_prompt and parcel["origin"] == "parcel_index" and not parcel.get("legal_description"):
+            return None
+
+        if verification_prompt:
+            legal_description = parcel.get("legal_description") or ""
+            if not legal_description and not parcel.get("verification_info", "Not found").startswith("Not found"):
+                legal_description = parcel["verification_info"]
+            result["verification_info"] = legal_description or "Not found"
+            result["verification_prompt"] = verification_prompt
+            result["is_semantic_match"] = bool(legal_description) and await self.check_semantic_match_with_llm(
+                legal_description,
+                verification_prompt
+            )
+        
+        return result
 
     def parse_legal_description(self, result_text):
         """Parse the result to extract the legal description"""
@@ -305,7 +611,6 @@ class APNSearcher:
         owner_patterns = [
             r"Owner Name.*?([A-Z][A-Z\s]+[A-Z])",
             r"Owner.*?([A-Z][A-Z\s]+[A-Z])",
-            r"(VASQUEZ[A-Z\s]+)",
         ]
         for pattern in owner_patterns:
             match = re.search(pattern, result_text)
@@ -336,6 +641,41 @@ class APNSearcher:
             "search_status": "SUCCESS" if apn_number else "APN_NOT_FOUND"
         }
 
+async def render_search_stream(stream, stage_area, progress_bar, status_text):
+    """Show each partial result of search_apn_stream() as soon as it arrives; returns the final result"""
+    stage_progress = {"county_resolved": 40, "detail_url": 55, "apn_found": 70, "legal_description": 80, "match_verdict": 90}
+    shown = []
+    result = None
+    
+    async for event in stream:
+        if event["stage"] == "done":
+            result = event["result"]
+            continue
+        
+        shown.append(event)
+        progress_bar.progress(stage_progress[event["stage"]])
+        status_text.text(SEARCH_STAGES[event["stage"]] + "...")
+        
+        # Re-draw the whole timeline in place so stages stay in order
+        with stage_area.container():
+            for shown_event in shown:
+                stage, data = shown_event["stage"], shown_event["data"]
+                if stage == "county_resolved":
+                    st.info(f"{SEARCH_STAGES[stage]}: {data['url']}")
+                elif stage == "detail_url":
+                    st.info(f"{SEARCH_STAGES[stage]}: {data['detail_url']}")
+                elif stage == "apn_found":
+                    st.success(f"{SEARCH_STAGES[stage]}: **{data['apn_number']}** (owner: {data.get('owner', 'Not found')})")
+                elif stage == "legal_description":
+                    st.info(f"{SEARCH_STAGES[stage]}: {data['verification_info']}")
+                elif stage == "match_verdict":
+                    if data["is_semantic_match"]:
+                        st.success(f"{SEARCH_STAGES[stage]}: ✅ matches \"{data['verification_prompt']}\"")
+                    else:
+                        st.warning(f"{SEARCH_STAGES[stage]}: ⚠️ does not match \"{data['verification_prompt']}\"")
+    
+    return result
+
 def save_search_history(search_data):
     """Save search history to a JSON file"""
      # check if logs directory exists, if not create it
@@ -375,6 +715,9 @@ def load_search_history():
         return []
 
 def main():
+    # Keep logs/conversations within its size/age budget for as long as the server runs
+    start_sweeper()
+    
     st.title("🏠 Corporate APN Lookup Tool")
     st.markdown("### AI-Powered Property APN (Assessor's Parcel Number) Search")
     
@@ -419,6 +762,12 @@ def main():
         help="Run browser in background (faster but no visual feedback)"
     )
     
+    keep_screenshot = st.sidebar.checkbox(
+        "📸 Keep Detail-Page Screenshots",
+        value=False,
+        help="Store a screenshot next to each detail-page snapshot"
+    )
+    
     show_debug = st.sidebar.checkbox(
         "🐛 Show Debug Info", 
         value=False,
@@ -436,6 +785,7 @@ def main():
                 # Create progress indicators
                 progress_bar = st.progress(0)
                 status_text = st.empty()
+                stage_area = st.empty()
                 
                 with st.spinner("🤖 AI Agent is searching for APN..."):
                     try:
@@ -449,9 +799,14 @@ def main():
                         progress_bar.progress(30)
                         status_text.text("Navigating to property records website...")
                         
-                        result = asyncio.run(
-                            searcher.search_apn(address, county, state, headless_mode, verification_prompt)
-                        )
+                        # Partial results (APN first, verification later) are drawn as each stage finishes
+                        result = asyncio.run(render_search_stream(
+                            searcher.search_apn_stream(address, county, state, headless_mode, verification_prompt, keep_screenshot),
+                            stage_area,
+                            progress_bar,
+                            status_text
+                        ))
+                        stage_area.empty()
                         
                         progress_bar.progress(90)
                         status_text.text("Processing APN search results...")
@@ -517,9 +872,15 @@ def main():
                                     for msg in result.get("cleanup_messages", []):
                                         st.text(f"• {msg}")
                                     
-                                    st.text("Raw Result (first 1000 chars):")
                                     raw_result = result.get("raw_result", "No raw result")
-                                    st.text(raw_result[:1000] + "..." if len(raw_result) > 1000 else raw_result)
+                                    if isinstance(raw_result, RawResultHandle):
+                                        # Only the first page is read from disk; the pager below reads the rest on demand
+                                        st.session_state.last_raw_result = raw_result
+                                        st.text(f"Raw Result (page 1 of {raw_result.page_count()}, {raw_result.length} chars):")
+                                        st.text(raw_result.read_page(0))
+                                    else:
+                                        st.text("Raw Result:")
+                                        st.text(raw_result)
                             
                             # Save to history
                             save_search_history(property_data)
@@ -542,12 +903,25 @@ def main():
                     except Exception as e:
                         progress_bar.empty()
                         status_text.empty()
+                        stage_area.empty()
                         st.error(f"❌ Unexpected error: {str(e)}")
                         
                         if show_debug:
                             st.exception(e)
             else:
                 st.warning("⚠️ Please enter both address and county")
+        
+        # Page through the last run's raw transcript; survives the reruns the page selector triggers
+        if show_debug and "last_raw_result" in st.session_state:
+            raw_result = st.session_state.last_raw_result
+            with st.expander("🗂️ Raw Agent Transcript"):
+                page = st.number_input(
+                    f"Page (of {raw_result.page_count()})",
+                    min_value=1,
+                    max_value=raw_result.page_count(),
+                    value=1
+                )
+                st.text(raw_result.read_page(page - 1))
     
     with col2:
         st.markdown("#### 📊 APN Search History")
@@ -577,6 +951,23 @@ def main():
                         if 'is_semantic_match' in search:
                             match_status = "✅ Match" if search.get('is_semantic_match') else "❌ No Match"
                             st.text(f"Semantic Match: {match_status}")
+                    
+                    # Thumbnails of the distinct pages the agent saw (made on first view, then cached)
+                    if search.get('screenshots'):
+                        screenshot_store = ScreenshotStore()
+                        manifest = screenshot_store.load_manifest(search['screenshots']['lookup_id'])
+                        if manifest:
+                            thumbs = []
+                            captions = []
+                            for frame in manifest["frames"]:
+                                if frame["duplicate"]:
+                                    continue
+                                thumb_path = screenshot_store.thumbnail(frame["blob"], frame["ext"])
+                                if thumb_path:
+                                    thumbs.append(thumb_path)
+                                    captions.append(f"Step {frame.get('step')}")
+                            if thumbs:
+                                st.image(thumbs, caption=captions, width=150)
         else:
             st.info("No APN search history yet. Run your first search!")
     
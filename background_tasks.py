@@ -0,0 +1,69 @@
+import threading
+
+try:
+    # Lets an updater thread draw into the Streamlit session that started it
+    from streamlit.runtime.scriptrunner import add_script_run_ctx
+except ImportError:
+    add_script_run_ctx = None
+
+# Updaters that are currently running, across all sessions
+_active_updaters = set()
+_active_lock = threading.Lock()
+
+
+def active_updater_count():
+    """Number of background updaters alive in this process"""
+    with _active_lock:
+        return len(_active_updaters)
+
+
+class BackgroundUpdater:
+    """
+    Calls a function every interval seconds on a background thread until stopped
+    Meant to live exactly as long as the job it reports on: start it with the job and stop it
+    in the job's finally block (or use it as a context manager). Stopping runs one last update,
+    so output printed just before the end is not lost, then joins the thread.
+    """
+
+    def __init__(self, update, interval=0.5, name="updater"):
+        self.update = update
+        self.interval = interval
+        self.name = name
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        if add_script_run_ctx is not None:
+            add_script_run_ctx(self.thread)
+        with _active_lock:
+            _active_updaters.add(self)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while True:
+                stopping = self.stop_event.wait(self.interval)
+                try:
+                    self.update()
+                except Exception as e:
+                    print(f"Background updater {self.name} failed: {e}")
+                if stopping:
+                    break
+        finally:
+            with _active_lock:
+                _active_updaters.discard(self)
+
+    def stop(self, timeout=5):
+        """Stop the updater and wait for its final update"""
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
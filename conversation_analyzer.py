@@ -0,0 +1,293 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+
+import zstandard
+
+from conversation_logs import CONVERSATION_LOG_DIR
+
+LOG_DIR = "logs"
+SEARCH_HISTORY_FILE = "logs/apn_search_history.json"
+
+# Rough token estimate for logged text (the logs carry no usage numbers)
+CHARS_PER_TOKEN = 4
+
+# Older runs wrote one directory per agent straight into logs/
+LEGACY_AGENT_PREFIXES = ("apn_search_", "verification_")
+
+STEP_FILE_PATTERN = re.compile(r"conversation_.*_(\d+)\.txt(\.zst)?$")
+MESSAGE_HEADER_PATTERN = re.compile(r"^ (\w+Message|RESPONSE) ?$")
+PROMPT_STEP_PATTERN = re.compile(r"\bStep\s*(\d+)", re.IGNORECASE)
+COUNTY_PATTERN = re.compile(r'select "([^"]+)" from the county list')
+
+
+def find_runs(log_dir=LOG_DIR, conversation_dir=CONVERSATION_LOG_DIR):
+    """Every agent run with conversation files: logs/conversations/<search_id>/<agent> and legacy logs/<agent>_<time>"""
+    runs = []
+    if os.path.isdir(conversation_dir):
+        for search_id in sorted(os.listdir(conversation_dir)):
+            search_dir = os.path.join(conversation_dir, search_id)
+            if not os.path.isdir(search_dir):
+                continue
+            for agent in sorted(os.listdir(search_dir)):
+                if os.path.isdir(os.path.join(search_dir, agent)):
+                    runs.append({"path": os.path.join(search_dir, agent), "search_id": search_id, "agent": agent})
+
+    if os.path.isdir(log_dir):
+        for name in sorted(os.listdir(log_dir)):
+            path = os.path.join(log_dir, name)
+            prefix = next((prefix for prefix in LEGACY_AGENT_PREFIXES if name.startswith(prefix)), None)
+            if prefix and os.path.isdir(path):
+                runs.append({"path": path, "search_id": name[len(prefix):], "agent": prefix.rstrip("_")})
+    return runs
+
+
+def _read_text(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode("utf-8", "replace")
+
+
+def parse_conversation(text):
+    """Split one step file into its (role, text) messages and the parsed model response"""
+    messages = []
+    role = None
+    lines = []
+    for line in text.split("\n"):
+        header = MESSAGE_HEADER_PATTERN.match(line)
+        if header:
+            if role:
+                messages.append((role, "\n".join(lines)))
+            role = header.group(1)
+            lines = []
+        else:
+            lines.append(line)
+    if role:
+        messages.append((role, "\n".join(lines)))
+
+    response = None
+    if messages and messages[-1][0] == "RESPONSE":
+        try:
+            response = json.loads(messages.pop()[1])
+        except json.JSONDecodeError:
+            response = None
+    return messages, response
+
+
+def _brain(response):
+    """next_goal / memory fields, flat (browser-use 0.3) or under current_state (older versions)"""
+    return response.get("current_state") or response
+
+
+def _prompt_step(response):
+    """Which numbered task step the agent says it is working on, if it names one"""
+    brain = _brain(response)
+    for field in ("next_goal", "memory"):
+        mentions = PROMPT_STEP_PATTERN.findall(brain.get(field) or "")
+        if mentions:
+            # next_goal names the step being started; memory tends to list the steps done so far
+            return int(mentions[0] if field == "next_goal" else mentions[-1])
+    return None
+
+
+def _action_signature(action):
+    """Short, stable description of one action, e.g. click_element_by_index {"index": 12}"""
+    name, params = next(iter(action.items())) if action else ("none", None)
+    return f"{name} {json.dumps(params, sort_keys=True)}" if params else name
+
+
+def analyze_run(run):
+    """Pool worker: parse every step file of one agent run"""
+    files = []
+    for name in os.listdir(run["path"]):
+        match = STEP_FILE_PATTERN.match(name)
+        if match:
+            files.append((int(match.group(1)), os.path.join(run["path"], name)))
+    files.sort()
+
+    result = dict(run, county=None, steps=[], errors=0)
+    previous_time = None
+    previous_actions = []
+    seen_actions = set()
+    prompt_step = None
+    for step, path in files:
+        try:
+            messages, response = parse_conversation(_read_text(path))
+        except Exception:
+            result["errors"] += 1
+            continue
+
+        if result["county"] is None:
+            # The task prompt names the county
+            for _, text in messages:
+                match = COUNTY_PATTERN.search(text)
+                if match:
+                    result["county"] = match.group(1)
+                    break
+
+        # Step files are written as each step's response arrives, so their times give the step gaps
+        step_time = os.path.getmtime(path)
+        gap = step_time - previous_time if previous_time is not None else None
+        previous_time = step_time
+
+        actions = [_action_signature(action) for action in (response or {}).get("action") or []]
+        prompt_step = (_prompt_step(response) if response else None) or prompt_step
+        result["steps"].append({
+            "step": step,
+            "prompt_step": prompt_step,
+            "tokens_in": sum(len(text) for _, text in messages) // CHARS_PER_TOKEN,
+            "tokens_out": len(json.dumps(response)) // CHARS_PER_TOKEN if response else 0,
+            "gap": gap,
+            "actions": actions,
+            # Same actions as the step before, or a return to actions already tried earlier in the run
+            "repeat": bool(actions) and actions == previous_actions,
+            "loop": bool(actions) and actions != previous_actions and tuple(actions) in seen_actions,
+        })
+        previous_actions = actions
+        seen_actions.add(tuple(actions))
+    return result
+
+
+def _counties_from_history(history_file):
+    if not os.path.exists(history_file):
+        return {}
+    try:
+        with open(history_file, 'r') as f:
+            history = json.load(f)
+    except Exception:
+        return {}
+    return {search["search_id"]: search.get("county") for search in history if search.get("search_id")}
+
+
+def _distribution(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        "min": values[0],
+        "median": values[len(values) // 2],
+        "p90": values[min(len(values) - 1, int(len(values) * 0.9))],
+        "max": values[-1],
+        "mean": sum(values) / len(values),
+    }
+
+
+def summarize(runs, top_actions=10):
+    """Aggregate analyzed runs per county (plus an "ALL" row) and per task step"""
+    groups = defaultdict(list)
+    for run in runs:
+        groups[run["county"] or "unknown"].append(run)
+        groups["ALL"].append(run)
+
+    report = {}
+    for county, county_runs in sorted(groups.items()):
+        steps = [step for run in county_runs for step in run["steps"]]
+        prompt_steps = defaultdict(lambda: {"turns": 0, "tokens": 0, "repeats": 0, "loops": 0, "seconds": 0.0})
+        repeated_actions = Counter()
+        for step in steps:
+            bucket = prompt_steps[step["prompt_step"] or 0]
+            bucket["turns"] += 1
+            bucket["tokens"] += step["tokens_in"] + step["tokens_out"]
+            bucket["repeats"] += step["repeat"]
+            bucket["loops"] += step["loop"]
+            bucket["seconds"] += step["gap"] or 0
+            if step["repeat"] or step["loop"]:
+                repeated_actions.update(step["actions"])
+
+        report[county] = {
+            "runs": len(county_runs),
+            "agents": dict(Counter(run["agent"] for run in county_runs)),
+            "steps_per_run": _distribution([len(run["steps"]) for run in county_runs]),
+            "seconds_between_steps": _distribution([step["gap"] for step in steps if step["gap"] is not None]),
+            "tokens_per_step": _distribution([step["tokens_in"] + step["tokens_out"] for step in steps]),
+            "repeats": sum(step["repeat"] for step in steps),
+            "loops": sum(step["loop"] for step in steps),
+            # Task step 0 collects turns whose goal never named a step
+            "prompt_steps": {str(number): bucket for number, bucket in sorted(prompt_steps.items())},
+            "repeated_actions": repeated_actions.most_common(top_actions),
+        }
+    return report
+
+
+def analyze(log_dir=LOG_DIR, conversation_dir=CONVERSATION_LOG_DIR, history_file=SEARCH_HISTORY_FILE, processes=None):
+    """Parse all conversation logs in parallel; returns (runs, report)"""
+    runs = find_runs(log_dir, conversation_dir)
+    if len(runs) > 1 and processes != 1:
+        with Pool(processes) as pool:
+            analyzed = pool.map(analyze_run, runs, chunksize=max(1, len(runs) // 64))
+    else:
+        analyzed = [analyze_run(run) for run in runs]
+
+    # The history knows the county of every search made since search ids were introduced
+    counties = _counties_from_history(history_file)
+    for run in analyzed:
+        run["county"] = counties.get(run["search_id"]) or run["county"]
+    return analyzed, summarize(analyzed)
+
+
+def _format_distribution(distribution, unit=""):
+    if not distribution:
+        return "-"
+    return (
+        f"median {distribution['median']:.0f}{unit}, p90 {distribution['p90']:.0f}{unit}, "
+        f"max {distribution['max']:.0f}{unit}"
+    )
+
+
+def print_report(report):
+    for county, summary in report.items():
+        print(f"\n🏛️ {county}: {summary['runs']} runs {summary['agents']}")
+        print(f"   Steps per run:         {_format_distribution(summary['steps_per_run'])}")
+        print(f"   Time between steps:    {_format_distribution(summary['seconds_between_steps'], 's')}")
+        print(f"   Tokens per step (est): {_format_distribution(summary['tokens_per_step'])}")
+        print(f"   Repeated steps: {summary['repeats']}, loops back to earlier actions: {summary['loops']}")
+
+        total_turns = sum(bucket["turns"] for bucket in summary["prompt_steps"].values()) or 1
+        print("   Task step   turns   share   tokens   repeats  loops   seconds")
+        for number, bucket in sorted(summary["prompt_steps"].items(), key=lambda item: -item[1]["turns"]):
+            label = f"Step {number}" if number != "0" else "unnamed"
+            print(
+                f"   {label:<10} {bucket['turns']:>6} {bucket['turns'] / total_turns:>7.0%} {bucket['tokens']:>8} "
+                f"{bucket['repeats']:>8} {bucket['loops']:>6} {bucket['seconds']:>9.0f}"
+            )
+        for action, count in summary["repeated_actions"]:
+            print(f"   🔁 {count:>4}x {action[:100]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mine saved agent conversation logs for wasted steps")
+    parser.add_argument("--logs", default=LOG_DIR, help="Directory holding legacy apn_search_*/verification_* logs")
+    parser.add_argument("--conversations", default=CONVERSATION_LOG_DIR, help="Per-search conversation log directory")
+    parser.add_argument("--history", default=SEARCH_HISTORY_FILE, help="Search history file (maps search ids to counties)")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    start = time.time()
+    runs, report = analyze(args.logs, args.conversations, args.history, args.processes)
+    elapsed = time.time() - start
+    if not runs:
+        print("⚠️ No conversation logs found")
+        return 1
+
+    print_report(report)
+    errors = sum(run["errors"] for run in runs)
+    steps = sum(len(run["steps"]) for run in runs)
+    print(f"\n✅ Analyzed {len(runs)} runs ({steps} steps, {errors} unreadable files) in {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"report": report, "runs": runs}, f, indent=2)
+        print(f"📄 Full report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import time
+import uuid
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+
+import zstandard
+
+CONVERSATION_LOG_DIR = "logs/conversations"
+
+# Retention budget: total compressed bytes and age, whichever is hit first
+MAX_CONVERSATION_BYTES = 200 * 1024 * 1024
+MAX_CONVERSATION_AGE = 30 * 24 * 3600
+
+# How often the background sweeper enforces the budget
+SWEEP_INTERVAL = 600
+
+
+def new_search_id():
+    """Unique id for one lookup (unlike int(time.time()), two lookups in the same second never collide)"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+class ConversationLogSink:
+    """
+    Agent conversation logs grouped by search, compressed once the agent is done
+    Each agent gets its own save_conversation_path under <log_dir>/<search_id>/; close() zstd-
+    compresses the files browser-use wrote there and records them in index.sqlite, so a search's
+    logs can be found by its id and the sweeper can enforce the retention budget.
+    """
+
+    def __init__(self, log_dir=CONVERSATION_LOG_DIR, max_bytes=MAX_CONVERSATION_BYTES, max_age=MAX_CONVERSATION_AGE):
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(log_dir, exist_ok=True)
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.log_dir, "index.sqlite"), timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversation_logs (
+                search_id TEXT,
+                agent TEXT,
+                path TEXT PRIMARY KEY,
+                files INTEGER,
+                bytes INTEGER,
+                raw_bytes INTEGER,
+                created_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_conversation_logs_search ON conversation_logs(search_id)")
+        return conn
+
+    def path_for(self, search_id, agent):
+        """save_conversation_path for one agent of a search"""
+        return os.path.join(self.log_dir, search_id, agent)
+
+    def close(self, search_id, agent):
+        """Compress an agent's conversation files and index them; returns the index row"""
+        path = self.path_for(search_id, agent)
+        if not os.path.isdir(path):
+            return None
+
+        files = 0
+        stored_bytes = 0
+        raw_bytes = 0
+        compressor = zstandard.ZstdCompressor(level=10)
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".zst"):
+                continue
+            source = os.path.join(path, name)
+            with open(source, 'rb') as f:
+                data = f.read()
+            with open(source + ".zst", 'wb') as f:
+                f.write(compressor.compress(data))
+            # Keep the write time: it is when the step happened, which the log analyzer relies on
+            source_stat = os.stat(source)
+            os.utime(source + ".zst", (source_stat.st_atime, source_stat.st_mtime))
+            os.remove(source)
+            files += 1
+            raw_bytes += len(data)
+            stored_bytes += os.path.getsize(source + ".zst")
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO conversation_logs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (search_id, agent, path, files, stored_bytes, raw_bytes, time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return {"search_id": search_id, "agent": agent, "path": path, "files": files, "bytes": stored_bytes, "raw_bytes": raw_bytes}
+
+    def logs_for(self, search_id):
+        """Index rows for every agent of one search"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                "SELECT * FROM conversation_logs WHERE search_id = ? ORDER BY created_at", (search_id,)
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def sweep(self):
+        """Delete whole searches, oldest first, that are past max_age or beyond max_bytes; returns how many"""
+        conn = self._connect()
+        try:
+            searches = conn.execute("""
+                SELECT search_id, SUM(bytes), MAX(created_at) FROM conversation_logs
+                GROUP BY search_id ORDER BY MAX(created_at) DESC
+            """).fetchall()
+
+            now = time.time()
+            kept_bytes = 0
+            expired = []
+            for search_id, search_bytes, created_at in searches:
+                kept_bytes += search_bytes or 0
+                if now - created_at > self.max_age or kept_bytes > self.max_bytes:
+                    expired.append(search_id)
+
+            # A process that died mid-search never closed its logs; age those directories out as well
+            indexed = {search_id for search_id, _, _ in searches}
+            for name in os.listdir(self.log_dir):
+                path = os.path.join(self.log_dir, name)
+                if name not in indexed and os.path.isdir(path) and now - os.path.getmtime(path) > self.max_age:
+                    expired.append(name)
+
+            for search_id in expired:
+                shutil.rmtree(os.path.join(self.log_dir, search_id), ignore_errors=True)
+                conn.execute("DELETE FROM conversation_logs WHERE search_id = ?", (search_id,))
+            conn.commit()
+            return len(expired)
+        finally:
+            conn.close()
+
+
+_sweeper_lock = threading.Lock()
+_sweeper_thread = None
+
+
+def start_sweeper(sink=None, interval=SWEEP_INTERVAL):
+    """Run sink.sweep() every interval seconds on one background thread per process"""
+    global _sweeper_thread
+    with _sweeper_lock:
+        if _sweeper_thread is not None and _sweeper_thread.is_alive():
+            return _sweeper_thread
+        sink = sink or ConversationLogSink()
+
+        def sweep_forever():
+            while True:
+                try:
+                    removed = sink.sweep()
+                    if removed:
+                        print(f"Conversation log sweeper removed {removed} old searches")
+                except Exception as e:
+                    print(f"Conversation log sweep failed: {e}")
+                time.sleep(interval)
+
+        _sweeper_thread = threading.Thread(target=sweep_forever, name="conversation_log_sweeper", daemon=True)
+        _sweeper_thread.start()
+        return _sweeper_thread
@@ -0,0 +1,185 @@
+import re
+from html.parser import HTMLParser
+
+# Result fields and the page labels CAD detail pages use for them (first match wins)
+DETAIL_FIELD_LABELS = {
+    "apn_number": ["Geographic ID", "APN", "Parcel Number"],
+    "owner": ["Owner Name", "Name"],
+    "appraised_value": ["Appraised Value", "Appraised"],
+    "legal_description": ["Legal Description"],
+}
+
+# Elements whose text never belongs to a label or value
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+
+
+def normalize_label(label):
+    """Canonical form of a page label: single spaces, no trailing colon"""
+    return re.sub(r"\s+", " ", label).strip().rstrip(":").strip()
+
+
+class LabelValueParser(HTMLParser):
+    """Single pass over detail-page HTML collecting table rows and definition lists as label -> value"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.label_values = {}
+        # Stacks, because CAD pages nest layout tables inside table cells
+        self._rows = []           # cells of each open table row: [(is_header, text)]
+        self._cells = []          # (is_header, text fragments) of each open th/td
+        self._term = None         # last <dt> text, waiting for its <dd>
+        self._definition = None   # text fragments of the current dt/dd
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "tr":
+            self._rows.append([])
+        elif tag in ("th", "td"):
+            self._cells.append((tag == "th", []))
+        elif tag in ("dt", "dd"):
+            self._definition = []
+        elif tag == "br":
+            self.handle_data(" ")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in ("th", "td") and self._cells:
+            is_header, fragments = self._cells.pop()
+            if self._rows:
+                self._rows[-1].append((is_header, " ".join(fragments)))
+        elif tag == "tr" and self._rows:
+            self._add_row(self._rows.pop())
+        elif tag == "dt" and self._definition is not None:
+            self._term = " ".join(self._definition)
+            self._definition = None
+        elif tag == "dd" and self._definition is not None:
+            if self._term:
+                self._add(self._term, " ".join(self._definition))
+            self._term = None
+            self._definition = None
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._cells:
+            self._cells[-1][1].append(data)
+        if self._definition is not None:
+            self._definition.append(data)
+
+    def _add_row(self, cells):
+        """A header cell or a "Label:" cell names the value in the cell after it"""
+        i = 0
+        while i < len(cells) - 1:
+            is_header, text = cells[i]
+            if is_header or text.strip().endswith(":"):
+                next_is_header, value = cells[i + 1]
+                if not next_is_header:
+                    self._add(text, value)
+                    i += 2
+                    continue
+            i += 1
+
+    def _add(self, label, value):
+        label = normalize_label(label)
+        value = re.sub(r"\s+", " ", value).strip()
+        # Keep the first occurrence - later sections repeat labels (e.g. previous owners)
+        if label and value and label not in self.label_values:
+            self.label_values[label] = value
+
+
+def extract_label_values(html):
+    """Normalized label -> value map of every table row and definition list on a detail page"""
+    parser = LabelValueParser()
+    parser.feed(html)
+    parser.close()
+    return parser.label_values
+
+
+def extract_fields_from_labels(label_values):
+    """Map a label -> value map onto result fields using DETAIL_FIELD_LABELS"""
+    lowered = {label.lower(): value for label, value in label_values.items()}
+    fields = {}
+
+    for field, labels in DETAIL_FIELD_LABELS.items():
+        for label in labels:
+            value = lowered.get(label.lower())
+            if value:
+                fields[field] = value
+                break
+
+    return fields
+
+
+def extract_detail_fields(html=None, page_text=None):
+    """
+    Extract detail fields from a detail page without any LLM calls
+    Args:
+        html: Page DOM (page.content()) or stored HTML - parsed exactly via tables/definition lists
+        page_text: Rendered page text - used for fields the HTML pass did not find
+    """
+    fields = extract_fields_from_labels(extract_label_values(html)) if html else {}
+
+    if page_text:
+        for field, value in extract_fields_from_text(page_text).items():
+            fields.setdefault(field, value)
+
+    return fields
+
+
+def extract_fields_from_text(page_text):
+    """
+    Extract detail fields from the rendered text of a property detail page
+    Table rows render as "Label:<tab>Value", other layouts put the value on the next line.
+    Returns a dict with only the fields that were found.
+    """
+    lines = [line.strip() for line in page_text.splitlines()]
+    fields = {}
+
+    for field, labels in DETAIL_FIELD_LABELS.items():
+        for label in labels:
+            value = _value_for_label(lines, label)
+            if value:
+                fields[field] = value
+                break
+
+    return fields
+
+
+def _label_pattern(label):
+    # The label must end at a word boundary and be followed by a colon, a cell gap, a number
+    # ("Parcel Number 123") or the end of the line, so "Name" cannot match "Names" or "Name Change History"
+    return re.compile(rf"^{re.escape(label)}\b(?:\s*:|\t|\s{{2,}}|\s(?=\d)|\s*$)\s*(.*)$", re.IGNORECASE)
+
+
+LABEL_PATTERNS = {label: _label_pattern(label) for labels in DETAIL_FIELD_LABELS.values() for label in labels}
+
+
+def _is_label_line(line):
+    """A line that is itself a label ("Geographic ID: 1", "Situs Address:") rather than a value"""
+    return line.endswith(":") or any(pattern.match(line) for pattern in LABEL_PATTERNS.values())
+
+
+def _value_for_label(lines, label):
+    """Find the value printed after a label, on the same line or the next non-empty one"""
+    label_pattern = LABEL_PATTERNS.get(label) or _label_pattern(label)
+
+    for i, line in enumerate(lines):
+        match = label_pattern.match(line)
+        if not match:
+            continue
+
+        value = match.group(1).strip()
+        if value:
+            return value
+
+        for next_line in lines[i + 1:i + 3]:
+            if not next_line:
+                continue
+            # An empty value followed by the next label - the field is blank, not that label's line
+            if _is_label_line(next_line):
+                break
+            return next_line
+    return None
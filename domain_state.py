@@ -0,0 +1,149 @@
+import os
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+DOMAIN_STATE_DIR = "data/storage_state"
+
+# A domain's saved state is discarded entirely after this long
+MAX_STATE_AGE = 7 * 24 * 3600
+
+# Session cookies (no expiry) usually point at a server-side session that times out much sooner
+SESSION_COOKIE_MAX_AGE = 30 * 60
+
+
+def state_host(host):
+    """
+    Host state is filed under, e.g. .esearch.beecad.org -> esearch.beecad.org
+    The full host, not the registrable domain: counties on shared hosting (*.tx.us,
+    trueautomation.com) must not share one file.
+    """
+    return (host or "").lstrip(".").lower()
+
+
+def _merge(saved, current, now):
+    """Saved state updated with the current run's; unexpired cookies and localStorage items not seen this run are kept"""
+    # Session cookies of earlier runs belong to server sessions that are gone by now
+    cookies = {
+        (cookie["name"], cookie["domain"], cookie.get("path", "/")): cookie
+        for cookie in saved.get("cookies", [])
+        if cookie.get("expires", -1) > now
+    }
+    for cookie in current["cookies"]:
+        cookies[(cookie["name"], cookie["domain"], cookie.get("path", "/"))] = cookie
+
+    origins = {origin["origin"]: {item["name"]: item for item in origin.get("localStorage", [])} for origin in saved.get("origins", [])}
+    for origin in current["origins"]:
+        origins.setdefault(origin["origin"], {}).update({item["name"]: item for item in origin.get("localStorage", [])})
+
+    return {
+        "cookies": list(cookies.values()),
+        "origins": [{"origin": origin, "localStorage": list(items.values())} for origin, items in origins.items()]
+    }
+
+
+class DomainStorageState:
+    """
+    Cookies and localStorage persisted per CAD host
+    Disclaimer / "I agree" pages and cookie banners remember their answer in cookies or
+    localStorage, so seeding a fresh profile with the last successful run's state skips them.
+    """
+
+    def __init__(self, state_dir=DOMAIN_STATE_DIR):
+        self.state_dir = state_dir
+
+    def _path(self, domain):
+        return os.path.join(self.state_dir, domain + ".json")
+
+    async def save(self, browser_context):
+        """Split the context's storage state by host and merge each part into its file; returns the hosts saved"""
+        state = await browser_context.storage_state()
+        now = time.time()
+
+        by_domain = {}
+        for cookie in state.get("cookies", []):
+            entry = by_domain.setdefault(state_host(cookie["domain"]), {"cookies": [], "origins": []})
+            entry["cookies"].append(cookie)
+        for origin in state.get("origins", []):
+            entry = by_domain.setdefault(state_host(urlsplit(origin["origin"]).hostname), {"cookies": [], "origins": []})
+            entry["origins"].append(origin)
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        for domain, entry in by_domain.items():
+            if not domain:
+                continue
+            # Keep what earlier runs saved for this host but this run never touched
+            entry = _merge(self._read(domain) or {}, entry, now)
+            entry["saved_at"] = now
+            entry["saved_at_iso"] = datetime.fromtimestamp(now).isoformat()
+            temp_path = self._path(domain) + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(entry, f, indent=2)
+            os.replace(temp_path, self._path(domain))
+        return sorted(domain for domain in by_domain if domain)
+
+    def _read(self, domain):
+        path = self._path(domain)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Failed to load storage state for {domain}: {e}")
+            return None
+
+    def load(self, domain):
+        """Unexpired state for one host, or None"""
+        path = self._path(domain)
+        entry = self._read(domain)
+        if entry is None:
+            return None
+
+        now = time.time()
+        age = now - entry.get("saved_at", 0)
+        if age > MAX_STATE_AGE:
+            os.remove(path)
+            return None
+
+        entry["cookies"] = [
+            cookie for cookie in entry.get("cookies", [])
+            if (cookie.get("expires", -1) > now) or (cookie.get("expires", -1) <= 0 and age < SESSION_COOKIE_MAX_AGE)
+        ]
+        return entry
+
+    def domains(self):
+        if not os.path.isdir(self.state_dir):
+            return []
+        return sorted(name[:-len(".json")] for name in os.listdir(self.state_dir) if name.endswith(".json"))
+
+    async def seed(self, browser_context):
+        """Pre-load every domain's unexpired cookies and localStorage into a new context"""
+        cookies = []
+        origins = []
+        for domain in self.domains():
+            entry = self.load(domain)
+            if entry:
+                cookies.extend(entry["cookies"])
+                origins.extend(entry.get("origins", []))
+
+        if cookies:
+            await browser_context.add_cookies(cookies)
+
+        # Playwright cannot set localStorage on an existing context, so write it on first load of each origin
+        if origins:
+            local_storage = {origin["origin"]: origin.get("localStorage", []) for origin in origins}
+            await browser_context.add_init_script(f"""
+                (() => {{
+                    const items = ({json.dumps(local_storage)})[window.location.origin];
+                    if (!items) return;
+                    for (const item of items) {{
+                        if (window.localStorage.getItem(item.name) === null) {{
+                            window.localStorage.setItem(item.name, item.value);
+                        }}
+                    }}
+                }})();
+            """)
+
+        return {"cookies": len(cookies), "origins": len(origins)}
@@ -0,0 +1,167 @@
+import os
+import json
+from collections import defaultdict
+
+from parcel_index import ParcelIndex, PARCEL_INDEX_PATH
+from address_normalizer import full_key
+
+SEARCH_HISTORY_FILE = "logs/apn_search_history.json"
+
+# How many trigram-ranked candidates get the (slower) edit-distance rescoring
+RESCORE_CANDIDATES = 50
+
+# A fuzzy match resolves an address only with this score and this lead over the runner-up
+CONFIDENT_SCORE = 0.7
+CONFIDENT_MARGIN = 0.1
+
+
+def trigrams(text):
+    """Character trigrams of a key, padded so short tokens and word starts count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+class FuzzyAddressMatcher:
+    """Trigram inverted index over known situs addresses with edit-distance rescoring"""
+
+    def __init__(self):
+        self.keys = []
+        self.entries = []
+        self.postings = defaultdict(list)
+
+    def add(self, address, entry):
+        """Index one known address; entry is returned with matches (e.g. the parcel row)"""
+        key = full_key(address)
+        if not key:
+            return
+        entry_id = len(self.keys)
+        self.keys.append(key)
+        self.entries.append(entry)
+        for gram in trigrams(key):
+            self.postings[gram].append(entry_id)
+
+    def search(self, address, limit=5):
+        """Ranked candidates for a typed address: [{"address", "score", "entry"}], best first"""
+        query = full_key(address)
+        if not query:
+            return []
+
+        # 1. Candidate generation: count shared trigrams through the inverted index
+        query_grams = trigrams(query)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for entry_id in self.postings.get(gram, ()):
+                shared[entry_id] += 1
+
+        ranked = sorted(shared.items(), key=lambda item: item[1], reverse=True)[:RESCORE_CANDIDATES]
+
+        # 2. Rescoring: trigram coverage of the query plus edit distance on the address prefix
+        query_number = query.split()[0] if query[0].isdigit() else None
+        matches = []
+        for entry_id, count in ranked:
+            key = self.keys[entry_id]
+            coverage = count / len(query_grams)
+            prefix_similarity = 1 - edit_distance(query, key[:len(query)]) / len(query)
+            score = 0.5 * coverage + 0.5 * max(prefix_similarity, 0)
+
+            # A different house number is a different property, however similar the street
+            if query_number and key.split()[0] != query_number:
+                score *= 0.5
+
+            matches.append({"address": key, "score": round(score, 3), "entry": self.entries[entry_id]})
+
+        matches.sort(key=lambda match: match["score"], reverse=True)
+        return matches[:limit]
+
+    def resolve(self, address):
+        """The single confident match for an ambiguous input, or None if a human/agent has to choose"""
+        # The same parcel is often known more than once (index row plus cached lookups, or repeat
+        # lookups in the history) - those are one candidate, not a tie
+        candidates = []
+        seen_apns = set()
+        for match in self.search(address, limit=RESCORE_CANDIDATES):
+            apn = match["entry"].get("apn") or match["entry"].get("apn_number")
+            if apn:
+                if apn in seen_apns:
+                    continue
+                seen_apns.add(apn)
+            candidates.append(match)
+
+        if not candidates or candidates[0]["score"] < CONFIDENT_SCORE:
+            return None
+        if len(candidates) > 1 and candidates[0]["score"] - candidates[1]["score"] < CONFIDENT_MARGIN:
+            return None
+        return candidates[0]
+
+
+def load_history_entries(county, history_file=SEARCH_HISTORY_FILE):
+    """Successful lookups from the search history (the app's result cache) for one county"""
+    if not os.path.exists(history_file):
+        return []
+    try:
+        with open(history_file, 'r') as f:
+            history = json.load(f)
+    except Exception as e:
+        print(f"Failed to load search history for fuzzy matching: {e}")
+        return []
+
+    # Entries saved before the county was recorded could belong to any county (and carry the old
+    # regex-guessed owner/value), so they are never offered as a match
+    return [
+        search for search in history
+        if search.get("search_status") == "SUCCESS"
+        and (search.get("county") or "").lower() == county.lower()
+    ]
+
+
+# Built matchers per county, rebuilt when one of their sources changes
+_matcher_cache = {}
+
+
+def _source_version(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def get_matcher(county, index_path=PARCEL_INDEX_PATH, history_file=SEARCH_HISTORY_FILE):
+    """Fuzzy matcher over the parcel index (incl. harvested rows) and the result cache for one county"""
+    # The index runs in WAL mode, so recent writes only touch the -wal file
+    version = (_source_version(index_path), _source_version(index_path + "-wal"), _source_version(history_file))
+    cached = _matcher_cache.get(county.lower())
+    if cached and cached[0] == version:
+        return cached[1]
+
+    matcher = FuzzyAddressMatcher()
+
+    parcel_index = ParcelIndex.open_existing(index_path)
+    if parcel_index is not None:
+        try:
+            rows = parcel_index.conn.execute(
+                "SELECT * FROM parcels WHERE county = ?", (county.lower(),)
+            ).fetchall()
+            for row in rows:
+                matcher.add(row["situs_address"], {**dict(row), "origin": "parcel_index"})
+        finally:
+            parcel_index.close()
+
+    for search in load_history_entries(county, history_file):
+        matcher.add(search["address"], {**search, "origin": "result_cache"})
+
+    _matcher_cache[county.lower()] = (version, matcher)
+    return matcher
@@ -0,0 +1,119 @@
+import asyncio
+
+from screenshot_store import ScreenshotStore, agent_frames
+
+# Screenshots kept inline in each agent's history; older ones are spilled to the screenshot store
+KEEP_INLINE_SCREENSHOTS = 3
+
+# Cap on the in-memory size of all agents' histories of one lookup
+MAX_HISTORY_BYTES = 8 * 1024 * 1024
+
+# Over the cap, extracted page text of older steps is cut to this many characters
+TRUNCATED_CONTENT_CHARS = 2000
+TRUNCATION_MARKER = "\n... [truncated to bound agent history memory]"
+
+
+def _item_bytes(item):
+    """Approximate in-memory size of one history step: its screenshot plus everything else serialized"""
+    screenshot = item.state.screenshot if item.state else None
+    other = len(item.model_dump_json(exclude={"state": {"screenshot"}}))
+    return other + len(screenshot or "")
+
+
+class HistoryMemoryPolicy:
+    """
+    Keeps the agents' step histories of one lookup within a memory budget
+    browser-use stores a base64 screenshot with every history step and the shared session keeps
+    both agents' histories alive until the lookup ends. After each step only the newest
+    keep_inline screenshots stay inline; older ones are written to the screenshot store (under a
+    pending manifest for lookup_id until the lookup is saved) and dropped from the step. If the
+    histories still exceed max_bytes, the remaining older screenshots are spilled as well and
+    long extracted page text of older steps is truncated.
+    """
+
+    def __init__(self, lookup_id, store=None, keep_inline=KEEP_INLINE_SCREENSHOTS, max_bytes=MAX_HISTORY_BYTES):
+        self.lookup_id = lookup_id
+        self.store = store or ScreenshotStore()
+        self.keep_inline = keep_inline
+        self.max_bytes = max_bytes
+        self.spilled = {}  # label -> frames stored on disk, in step order
+        self.sizes = {}  # label -> bytes of each history step, by index
+        self.peak_bytes = 0
+        self.spilled_bytes = 0
+        self.truncated_steps = 0
+
+    def hook(self, label):
+        """on_step_end callback for Agent.run"""
+        async def on_step_end(agent):
+            await self.on_step_end(agent, label)
+        return on_step_end
+
+    async def on_step_end(self, agent, label):
+        # The agent waits for its step hooks, so its history is not touched while this runs
+        try:
+            await asyncio.to_thread(self.enforce, agent.state.history.history, label)
+        except Exception as e:
+            print(f"History memory policy failed: {e}")
+
+    def current_bytes(self):
+        return sum(sum(sizes) for sizes in self.sizes.values())
+
+    def enforce(self, items, label):
+        sizes = self.sizes.setdefault(label, [])
+        sizes.extend(_item_bytes(item) for item in items[len(sizes):])
+
+        inline = [index for index, item in enumerate(items) if item.state and item.state.screenshot]
+        for index in inline[:max(0, len(inline) - self.keep_inline)]:
+            self._spill(items, index, label)
+
+        if self.current_bytes() > self.max_bytes:
+            # Over budget: keep only the newest screenshot, then shorten old page text
+            for index in inline[-self.keep_inline:-1]:
+                self._spill(items, index, label)
+            for index, item in enumerate(items[:-1]):
+                if self.current_bytes() <= self.max_bytes:
+                    break
+                if self._truncate(item):
+                    sizes[index] = _item_bytes(item)
+                    self.truncated_steps += 1
+
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+    def _spill(self, items, index, label):
+        item = items[index]
+        if not item.state.screenshot:
+            return
+        entry = self.store.spill(
+            {"image": item.state.screenshot, "step": index + 1, "url": item.state.url, "label": label},
+            self.lookup_id
+        )
+        if entry:
+            self.spilled.setdefault(label, []).append(entry)
+        self.spilled_bytes += len(item.state.screenshot)
+        item.state.screenshot = None
+        self.sizes[label][index] = _item_bytes(item)
+
+    def _truncate(self, item):
+        truncated = False
+        for result in item.result:
+            # Already truncated text is exactly limit + marker long, so it is never cut twice
+            if result.extracted_content and len(result.extracted_content) > TRUNCATED_CONTENT_CHARS + len(TRUNCATION_MARKER):
+                result.extracted_content = result.extracted_content[:TRUNCATED_CONTENT_CHARS] + TRUNCATION_MARKER
+                truncated = True
+        return truncated
+
+    def frames(self, agent, label):
+        """All screenshots of an agent's run for ScreenshotStore.save_lookup: spilled ones plus those still inline"""
+        frames = self.spilled.get(label, []) + agent_frames(agent, label)
+        return sorted(frames, key=lambda frame: frame["step"])
+
+    def stats(self):
+        return {
+            "peak_history_bytes": self.peak_bytes,
+            "history_bytes": self.current_bytes(),
+            "spilled_screenshots": sum(len(frames) for frames in self.spilled.values()),
+            "spilled_bytes": self.spilled_bytes,
+            "truncated_steps": self.truncated_steps,
+            "keep_inline": self.keep_inline,
+            "max_bytes": self.max_bytes
+        }
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from email.utils import parsedate_to_datetime
+
+HTTP_CACHE_DIR = "data/http_cache"
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+
+# Static assets without caching headers are still reused for this long
+STATIC_ASSET_TTL = 24 * 3600
+STATIC_RESOURCE_TYPES = {"script", "stylesheet", "font", "image"}
+
+# Headers that describe the original transfer, not the (already decoded) body we serve
+HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+# HAR recording/replay, e.g. BROWSER_HAR_MODE=replay BROWSER_HAR_PATH=data/har/bee.har for offline runs
+HAR_MODE_ENV = "BROWSER_HAR_MODE"
+HAR_PATH_ENV = "BROWSER_HAR_PATH"
+DEFAULT_HAR_PATH = "data/har/session.har"
+
+
+def _cache_control(headers):
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    return directives
+
+
+def freshness_lifetime(headers, resource_type):
+    """
+    Seconds a response may be served without revalidation, or None if it must not be stored
+    Follows Cache-Control / Expires; static assets without either get STATIC_ASSET_TTL,
+    pages without either are not cached.
+    """
+    directives = _cache_control(headers)
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return int(directives[name])
+
+    if headers.get("expires"):
+        try:
+            expires = parsedate_to_datetime(headers["expires"]).timestamp()
+            return max(0, int(expires - time.time()))
+        except Exception:
+            return 0
+
+    if resource_type in STATIC_RESOURCE_TYPES:
+        return STATIC_ASSET_TTL
+    return None
+
+
+class RouteCache:
+    """
+    Size-bounded on-disk HTTP cache served through Playwright route interception
+    Shared by every lookup, so the throwaway browser profiles no longer start cold.
+    Fresh entries are served locally, stale ones are revalidated with ETag / Last-Modified,
+    and the least recently used bodies are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=MAX_CACHE_BYTES, offline=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats_counts = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "bytes_served": 0}
+
+        os.makedirs(os.path.join(cache_dir, "bodies"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                headers TEXT,
+                body_file TEXT,
+                size INTEGER,
+                expires_at REAL,
+                last_access REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        self.conn.commit()
+
+    async def install(self, browser_context):
+        await browser_context.route("**/*", self.handle)
+
+    async def handle(self, route):
+        """Route handler: serve from cache, revalidate, or fetch and store"""
+        request = route.request
+        if request.method != "GET" or not request.url.startswith("http"):
+            await route.continue_()
+            return
+
+        entry = self.conn.execute("SELECT * FROM entries WHERE url = ?", (request.url,)).fetchone()
+        now = time.time()
+
+        if entry and (entry[5] > now or self.offline):
+            self.stats_counts["hits"] += 1
+            await self._fulfill_from_entry(route, entry)
+            return
+
+        if self.offline:
+            await route.abort("internetdisconnected")
+            return
+
+        headers = dict(request.headers)
+        if entry:
+            cached_headers = json.loads(entry[2])
+            if cached_headers.get("etag"):
+                headers["if-none-match"] = cached_headers["etag"]
+            if cached_headers.get("last-modified"):
+                headers["if-modified-since"] = cached_headers["last-modified"]
+
+        try:
+            response = await route.fetch(headers=headers)
+        except Exception as e:
+            print(f"HTTP cache fetch failed for {request.url}: {e}")
+            await route.continue_()
+            return
+
+        if entry and response.status == 304:
+            self.stats_counts["revalidated"] += 1
+            lifetime = freshness_lifetime(response.headers, request.resource_type) or 0
+            self.conn.execute("UPDATE entries SET expires_at = ? WHERE url = ?", (now + lifetime, request.url))
+            self.conn.commit()
+            await self._fulfill_from_entry(route, entry)
+            return
+
+        self.stats_counts["misses"] += 1
+        body = await response.body()
+        response_headers = {name: value for name, value in response.headers.items() if name.lower() not in HOP_HEADERS}
+        await route.fulfill(status=response.status, headers=response_headers, body=body)
+
+        lifetime = freshness_lifetime(response.headers, request.resource_type)
+        # Pages that set cookies are per-visitor; never replay them to another lookup
+        if response.status == 200 and lifetime is not None and not (
+            request.resource_type == "document" and "set-cookie" in response.headers
+        ):
+            self._store(request.url, response.status, response_headers, body, now + lifetime)
+
+    async def _fulfill_from_entry(self, route, entry):
+        url, status, headers, body_file = entry[0], entry[1], json.loads(entry[2]), entry[3]
+        try:
+            with open(os.path.join(self.cache_dir, "bodies", body_file), 'rb') as f:
+                body = f.read()
+        except OSError:
+            # Body evicted or lost underneath the index - forget the entry and go to the network
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self.conn.commit()
+            await route.continue_()
+            return
+
+        self.conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+        self.conn.commit()
+        self.stats_counts["bytes_served"] += len(body)
+        await route.fulfill(status=status, headers=headers, body=body)
+
+    def _store(self, url, status, headers, body, expires_at):
+        body_file = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        with open(os.path.join(self.cache_dir, "bodies", body_file), 'wb') as f:
+            f.write(body)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, status, json.dumps(headers), body_file, len(body), expires_at, time.time())
+        )
+        self.conn.commit()
+        self.stats_counts["stored"] += 1
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for url, body_file, size in self.conn.execute(
+            "SELECT url, body_file, size FROM entries ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, "bodies", body_file))
+            except OSError:
+                pass
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+        self.conn.commit()
+
+    def stats(self):
+        requests_seen = self.stats_counts["hits"] + self.stats_counts["revalidated"] + self.stats_counts["misses"]
+        return {
+            **self.stats_counts,
+            "hit_rate": round((self.stats_counts["hits"] + self.stats_counts["revalidated"]) / requests_seen, 3) if requests_seen else 0
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+async def install_http_cache(browser_context, har_mode=None, har_path=None):
+    """
+    Install the network layer for a browser context
+    har_mode "record" captures the real network into a HAR file, "replay" serves only from
+    that HAR (anything missing is aborted, so runs are fully offline); otherwise the shared
+    route cache is used. Returns the RouteCache, or None in HAR mode.
+    """
+    har_mode = har_mode or os.getenv(HAR_MODE_ENV)
+    har_path = har_path or os.getenv(HAR_PATH_ENV) or DEFAULT_HAR_PATH
+
+    if har_mode == "record":
+        os.makedirs(os.path.dirname(har_path) or ".", exist_ok=True)
+        await browser_context.route_from_har(har_path, update=True, update_content="embed")
+        print(f"Recording network to {har_path}")
+        return None
+    if har_mode == "replay":
+        await browser_context.route_from_har(har_path, not_found="abort")
+        print(f"Replaying network from {har_path} (offline)")
+        return None
+
+    route_cache = RouteCache()
+    await route_cache.install(browser_context)
+    return route_cache
+
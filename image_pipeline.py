@@ -0,0 +1,145 @@
+import io
+import math
+import base64
+
+from PIL import Image
+
+
+def estimate_image_tokens(width, height):
+    """Estimate GPT-4o image tokens for a high-detail image of the given size"""
+    # The API first fits the image inside 2048x2048, then scales the shortest side down to 768
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return 85 + 170 * tiles
+
+
+def difference_hash(image, hash_size=8):
+    """Perceptual hash of an image - small Hamming distances mean visually similar frames"""
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = list(small.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+class ScreenshotPipeline:
+    """Shrinks screenshots between the browser session and the LLM message builder"""
+
+    def __init__(self, max_image_tokens=765, image_format="JPEG", quality=60, dedup_distance=3):
+        self.max_image_tokens = max_image_tokens
+        self.image_format = image_format
+        self.quality = quality
+        # Frames within this Hamming distance of the previous upload count as unchanged
+        self.dedup_distance = dedup_distance
+
+        self.frames = 0
+        self.frames_reused = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self._last_hash = None
+        self._last_encoded = None
+        self._last_tokens = 0
+
+    def install(self, browser_session, should_process=None):
+        """
+        Route every screenshot the session hands to an agent through this pipeline
+        Args:
+            browser_session: browser-use BrowserSession shared by the agents
+            should_process: Optional callable; frames pass through untouched when it returns False
+                            (e.g. steps that run on DOM text only)
+        """
+        original_get_state_summary = browser_session.get_state_summary
+
+        async def get_state_summary(*args, **kwargs):
+            state = await original_get_state_summary(*args, **kwargs)
+
+            if not state.screenshot or (should_process and not should_process()):
+                # A text-only step breaks the chain of consecutive uploads
+                self._last_hash = None
+                self._last_encoded = None
+                return state
+
+            viewport = None
+            try:
+                page = await browser_session.get_current_page()
+                viewport = page.viewport_size
+            except Exception:
+                pass
+
+            state.screenshot = self.process(state.screenshot, viewport)
+            return state
+
+        # BrowserSession is a pydantic model, so bypass its __setattr__ to shadow the method
+        object.__setattr__(browser_session, "get_state_summary", get_state_summary)
+        return browser_session
+
+    def process(self, screenshot_b64, viewport=None):
+        """Crop, downscale and re-encode one base64 PNG screenshot"""
+        raw = base64.b64decode(screenshot_b64)
+        image = Image.open(io.BytesIO(raw))
+        image.load()
+
+        self.frames += 1
+        self.bytes_in += len(raw)
+        tokens_before = estimate_image_tokens(*image.size)
+        self.tokens_in += tokens_before
+
+        # 1. Crop to the visible viewport
+        if viewport:
+            width = min(image.width, viewport["width"])
+            height = min(image.height, viewport["height"])
+            if (width, height) != image.size:
+                image = image.crop((0, 0, width, height))
+
+        # 2. A frame that looks the same as the one sent on the previous step reuses its encoding.
+        # It is still sent: browser-use drops the previous step's image from the conversation, and
+        # vision is only on because the agent is stuck, so the model needs to see the page again
+        frame_hash = difference_hash(image)
+        if self._last_hash is not None and bin(frame_hash ^ self._last_hash).count("1") <= self.dedup_distance:
+            self.frames_reused += 1
+            self.bytes_out += len(self._last_encoded)
+            self.tokens_out += self._last_tokens
+            return base64.b64encode(self._last_encoded).decode("utf-8")
+        self._last_hash = frame_hash
+
+        # 3. Downscale until the image fits the token budget
+        width, height = image.size
+        while estimate_image_tokens(width, height) > self.max_image_tokens and min(width, height) > 64:
+            width, height = int(width * 0.9), int(height * 0.9)
+        if (width, height) != image.size:
+            image = image.resize((width, height), Image.LANCZOS)
+
+        # 4. Re-encode in a lossy format
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format=self.image_format, quality=self.quality)
+        encoded = buffer.getvalue()
+
+        self._last_encoded = encoded
+        self._last_tokens = estimate_image_tokens(width, height)
+        self.bytes_out += len(encoded)
+        self.tokens_out += self._last_tokens
+        return base64.b64encode(encoded).decode("utf-8")
+
+    def stats(self):
+        """Bytes and image tokens saved by the pipeline for this lookup"""
+        return {
+            "frames": self.frames,
+            "frames_reused": self.frames_reused,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "image_tokens_in": self.tokens_in,
+            "image_tokens_out": self.tokens_out,
+            "image_tokens_saved": self.tokens_in - self.tokens_out
+        }
@@ -0,0 +1,71 @@
+import os
+import codecs
+from collections import deque
+
+# Lines kept on screen by default; older blocks are removed from the page
+LIVE_OUTPUT_MAX_LINES = 500
+
+
+class LiveOutput:
+    """
+    Live log view that only sends newly appended lines to the browser
+    Each update adds one small code block holding just the new lines to a Streamlit container;
+    once more than max_lines are shown, the oldest blocks are emptied. Earlier blocks are never
+    re-sent, so the cost of an update depends on what was appended, not on how long the run is.
+    """
+
+    def __init__(self, container, max_lines=LIVE_OUTPUT_MAX_LINES):
+        self.container = container
+        self.max_lines = max_lines
+        self.blocks = deque()  # (placeholder, line count), oldest first
+        self.line_count = 0
+        self.partial = ""      # last line, held back until its newline arrives
+        self.cursor = 0        # LogRing sequence number or file byte offset already shown
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+    def append(self, text):
+        """Show the complete lines in text; returns how many lines were added"""
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        if not lines:
+            return 0
+
+        block = self.container.empty()
+        block.code("\n".join(lines), language=None)
+        self.blocks.append((block, len(lines)))
+        self.line_count += len(lines)
+
+        # Keep at least max_lines visible, dropping whole blocks from the top
+        while len(self.blocks) > 1 and self.line_count - self.blocks[0][1] >= self.max_lines:
+            old_block, old_lines = self.blocks.popleft()
+            old_block.empty()
+            self.line_count -= old_lines
+        return len(lines)
+
+    def flush(self):
+        """Show the unterminated last line (e.g. when the run is over)"""
+        if self.partial:
+            self.append("\n")
+
+    def update_from_ring(self, log_ring):
+        """Append what was written to a LogRing since the last update"""
+        text, self.cursor, dropped = log_ring.read_since(self.cursor)
+        if dropped:
+            text = f"... {dropped} bytes of output skipped ...\n" + text
+        return self.append(text) if text else 0
+
+    def update_from_file(self, path):
+        """Append what was written to a log file since the last update"""
+        if not os.path.exists(path):
+            return 0
+        if os.path.getsize(path) < self.cursor:
+            # The file was truncated or replaced - start over from its beginning
+            self.cursor = 0
+            self.decoder.reset()
+        with open(path, 'rb') as f:
+            f.seek(self.cursor)
+            data = f.read()
+        self.cursor += len(data)
+        # A read can end inside a multi-byte character; the decoder keeps those bytes for the next one
+        text = self.decoder.decode(data)
+        return self.append(text) if text else 0
@@ -0,0 +1,129 @@
+import time
+import base64
+import asyncio
+import hashlib
+
+# Frames per second delivered to the UI at most
+LIVE_VIEW_MAX_FPS = 4
+
+
+class ScreencastView:
+    """
+    Live browser view built on Chrome DevTools screencast frames
+    Chrome pushes a JPEG only when the page repaints, so an idle page costs nothing. Frames are
+    throttled to max_fps (the newest frame inside a throttled interval is delivered at its end),
+    identical frames are skipped, and frames go straight to on_frame(jpeg_bytes, info) without
+    touching disk. Works with headless Chromium, no X server needed.
+    """
+
+    def __init__(self, on_frame, max_fps=LIVE_VIEW_MAX_FPS, quality=60, max_width=1280, max_height=800):
+        self.on_frame = on_frame
+        self.min_interval = 1 / max_fps
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+
+        self.page = None
+        self.cdp = None
+        self.last_delivered = 0
+        self.last_digest = None
+        self.pending = None
+        self.flush_task = None
+        self.frames_received = 0
+        self.frames_delivered = 0
+        self.bytes_delivered = 0
+
+    async def attach(self, page):
+        """Start streaming frames of a page (stops streaming the previous one)"""
+        await self.detach()
+        self.page = page
+        cdp = self.cdp = await page.context.new_cdp_session(page)
+        cdp.on("Page.screencastFrame", lambda params: self._on_screencast_frame(cdp, params))
+        await cdp.send("Page.startScreencast", {
+            "format": "jpeg",
+            "quality": self.quality,
+            "maxWidth": self.max_width,
+            "maxHeight": self.max_height,
+            "everyNthFrame": 1
+        })
+
+    async def detach(self):
+        if self.flush_task:
+            self.flush_task.cancel()
+            self.flush_task = None
+        if self.cdp is not None:
+            try:
+                await self.cdp.send("Page.stopScreencast")
+                await self.cdp.detach()
+            except Exception:
+                # The page may already be closed
+                pass
+        self.cdp = None
+        self.page = None
+
+    def hook(self):
+        """
+        on_step_start hook for Agent.run(): follows the agent to whatever tab it is working in
+        """
+        async def on_step_start(agent):
+            try:
+                page = await agent.browser_session.get_current_page()
+                if page is not self.page:
+                    await self.attach(page)
+            except Exception as e:
+                print(f"Live view could not attach to page: {e}")
+        return on_step_start
+
+    def _on_screencast_frame(self, cdp, params):
+        # Chrome sends the next frame only after this one is acknowledged
+        asyncio.ensure_future(self._ack(cdp, params["sessionId"]))
+        self.frames_received += 1
+
+        self.pending = params
+        wait = self.last_delivered + self.min_interval - time.monotonic()
+        if wait <= 0:
+            self._deliver()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self._deliver_later(wait))
+
+    async def _ack(self, cdp, session_id):
+        try:
+            await cdp.send("Page.screencastFrameAck", {"sessionId": session_id})
+        except Exception:
+            pass
+
+    async def _deliver_later(self, wait):
+        await asyncio.sleep(wait)
+        self.flush_task = None
+        self._deliver()
+
+    def _deliver(self):
+        params, self.pending = self.pending, None
+        if params is None:
+            return
+
+        # Base64 text of the JPEG is enough to spot an unchanged frame without decoding it
+        digest = hashlib.sha1(params["data"].encode("ascii")).digest()
+        if digest == self.last_digest:
+            return
+        self.last_digest = digest
+        self.last_delivered = time.monotonic()
+
+        jpeg = base64.b64decode(params["data"])
+        self.frames_delivered += 1
+        self.bytes_delivered += len(jpeg)
+        try:
+            self.on_frame(jpeg, {
+                "url": self.page.url if self.page else None,
+                "timestamp": params.get("metadata", {}).get("timestamp"),
+                "frame": self.frames_delivered
+            })
+        except Exception as e:
+            print(f"Live view frame handler failed: {e}")
+
+    def stats(self):
+        return {
+            "frames_received": self.frames_received,
+            "frames_delivered": self.frames_delivered,
+            "bytes_delivered": self.bytes_delivered
+        }
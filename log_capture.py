@@ -0,0 +1,102 @@
+import sys
+import threading
+import contextvars
+
+# Bytes of output kept per session; older output is overwritten
+DEFAULT_RING_CAPACITY = 256 * 1024
+
+
+class LogRing:
+    """
+    Fixed-capacity byte ring buffer with sequence numbers
+    Every byte written gets the next sequence number (the running byte count), so a reader
+    keeps a cursor and fetches only what was written after it. Writes go straight into the
+    preallocated buffer - nothing is ever rebuilt or joined on the write path.
+    """
+
+    def __init__(self, capacity=DEFAULT_RING_CAPACITY):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity)
+        self.end = 0  # sequence number of the next byte to be written
+        self.lock = threading.Lock()
+
+    @property
+    def start(self):
+        """Sequence number of the oldest byte still held"""
+        return max(0, self.end - self.capacity)
+
+    def write(self, text):
+        data = text.encode("utf-8", "replace")
+        if len(data) > self.capacity:
+            # Only the tail of an oversized write can survive anyway
+            skipped = len(data) - self.capacity
+            data = data[skipped:]
+        else:
+            skipped = 0
+
+        with self.lock:
+            self.end += skipped
+            position = self.end % self.capacity
+            first = min(len(data), self.capacity - position)
+            self.buffer[position:position + first] = data[:first]
+            self.buffer[:len(data) - first] = data[first:]
+            self.end += len(data)
+        return len(text)
+
+    def read_since(self, cursor=0):
+        """
+        Output written after cursor, as (text, new_cursor, dropped)
+        dropped is the number of bytes that were overwritten before this reader got to them.
+        """
+        with self.lock:
+            start, end = self.start, self.end
+            dropped = max(0, start - cursor)
+            cursor = max(cursor, start)
+            if cursor >= end:
+                return "", end, dropped
+
+            first_position = cursor % self.capacity
+            last_position = end % self.capacity
+            if first_position < last_position:
+                data = bytes(self.buffer[first_position:last_position])
+            else:
+                data = bytes(self.buffer[first_position:]) + bytes(self.buffer[:last_position])
+
+        # A cursor can land inside a multi-byte character once the oldest output is overwritten
+        return data.decode("utf-8", "replace"), end, dropped
+
+    def clear(self):
+        with self.lock:
+            self.end = 0
+
+
+# Ring of the search running in the current thread / asyncio task
+current_log_ring = contextvars.ContextVar("current_log_ring", default=None)
+
+
+class StdoutRouter:
+    """sys.stdout replacement that copies output into the current session's LogRing"""
+
+    def __init__(self, terminal):
+        self.terminal = terminal
+
+    def write(self, text):
+        # Keep everything visible in the terminal as before
+        self.terminal.write(text)
+        log_ring = current_log_ring.get()
+        if log_ring is not None:
+            log_ring.write(text)
+        return len(text)
+
+    def flush(self):
+        self.terminal.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.terminal, name)
+
+
+def install_stdout_router():
+    """Route stdout through StdoutRouter once per process (Streamlit re-executes the script on every rerun)"""
+    if not isinstance(sys.stdout, StdoutRouter):
+        sys.stdout = StdoutRouter(sys.stdout)
+    return sys.stdout
@@ -0,0 +1,347 @@
+import os
+import re
+import csv
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from address_normalizer import street_key, full_key
+
+PARCEL_INDEX_PATH = "data/parcel_index.sqlite"
+
+# Let SQLite read the index through a memory map instead of read() calls
+MMAP_SIZE = 1024 * 1024 * 1024
+
+# Default fixed-width layout (1-based inclusive columns) of the True Automation
+# appraisal-roll export (APPRAISAL_INFO.TXT) that most Texas CADs publish
+TRUE_AUTOMATION_LAYOUT = {
+    "prop_id": (1, 12),
+    "geo_id": (547, 596),
+    "owner_name": (609, 678),
+    "situs_street_prefix": (1040, 1049),
+    "situs_street": (1050, 1099),
+    "situs_street_suffix": (1100, 1109),
+    "situs_city": (1110, 1139),
+    "situs_zip": (1140, 1149),
+    "legal_description": (1150, 1404),
+    "appraised_value": (1916, 1930),
+    "situs_num": (4460, 4474),
+    "situs_unit": (4475, 4479),
+}
+
+# CSV header names (lower-case) accepted for each column
+CSV_COLUMNS = {
+    "prop_id": ["prop_id", "property id", "property_id", "account"],
+    "geo_id": ["geo_id", "geographic id", "geographic_id", "apn", "parcel number", "parcel_number"],
+    "owner_name": ["owner_name", "owner name", "py_owner_name", "owner"],
+    "situs_num": ["situs_num", "situs number", "street number"],
+    "situs_street_prefix": ["situs_street_prefx", "situs_street_prefix"],
+    "situs_street": ["situs_street", "street name"],
+    "situs_street_suffix": ["situs_street_suffix", "street suffix"],
+    "situs_unit": ["situs_unit", "unit"],
+    "situs_city": ["situs_city", "city"],
+    "situs_zip": ["situs_zip", "zip"],
+    "situs_address": ["situs", "situs_address", "situs address", "property address", "address"],
+    "legal_description": ["legal_desc", "legal description", "legal_description"],
+    "appraised_value": ["appraised_val", "appraised value", "appraised_value", "market value"],
+}
+
+
+def normalize_key(text):
+    """Lookup key for free text: upper case, punctuation stripped, single spaces"""
+    text = re.sub(r"[^A-Z0-9 ]", " ", (text or "").upper())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class ParcelIndex:
+    """On-disk parcel index built from bulk appraisal-roll exports, keyed by situs address, APN and owner"""
+
+    def __init__(self, index_path=PARCEL_INDEX_PATH):
+        self.index_path = index_path
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+
+        self.conn = sqlite3.connect(index_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    @classmethod
+    def open_existing(cls, index_path=PARCEL_INDEX_PATH):
+        """Open the index only if it has been built - lookups must not create empty files"""
+        if not os.path.exists(index_path):
+            return None
+        return cls(index_path)
+
+    def _create_tables(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS parcels (
+                county TEXT NOT NULL,
+                apn TEXT NOT NULL,
+                prop_id TEXT,
+                situs_address TEXT,
+                situs_key TEXT,
+                full_key TEXT,
+                owner_name TEXT,
+                owner_key TEXT,
+                legal_description TEXT,
+                appraised_value TEXT,
+                source TEXT,
+                imported_at TEXT,
+                detail_url TEXT,
+                PRIMARY KEY (county, apn)
+            );
+            CREATE INDEX IF NOT EXISTS idx_parcels_situs ON parcels (county, situs_key);
+            CREATE INDEX IF NOT EXISTS idx_parcels_full ON parcels (county, full_key);
+            CREATE INDEX IF NOT EXISTS idx_parcels_apn ON parcels (apn);
+            CREATE INDEX IF NOT EXISTS idx_parcels_owner ON parcels (owner_key);
+
+            CREATE TABLE IF NOT EXISTS imports (
+                source TEXT PRIMARY KEY,
+                county TEXT,
+                size INTEGER,
+                mtime REAL,
+                rows INTEGER,
+                imported_at TEXT
+            );
+        """)
+
+        # Indexes built before detail URLs were harvested lack the column
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(parcels)")}
+        if "detail_url" not in columns:
+            self.conn.execute("ALTER TABLE parcels ADD COLUMN detail_url TEXT")
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------ import
+
+    def import_file(self, path, county, file_format=None, layout=None, force=False):
+        """
+        Import one appraisal-roll export into the index
+        Args:
+            path: CSV or fixed-width export file
+            county: County the export belongs to (e.g. "Bee")
+            file_format: "csv" or "fixed" (guessed from the extension when omitted)
+            layout: Fixed-width column layout (defaults to TRUE_AUTOMATION_LAYOUT)
+            force: Re-import even if the file has not changed since the last import
+        Returns the number of rows upserted (0 when the file was unchanged)
+        """
+        source = os.path.abspath(path)
+        stat = os.stat(path)
+
+        # Incremental re-import: skip files whose size and mtime are unchanged
+        previous = self.conn.execute("SELECT size, mtime FROM imports WHERE source = ?", (source,)).fetchone()
+        if previous and not force and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+            return 0
+
+        if file_format is None:
+            file_format = "csv" if path.lower().endswith(".csv") else "fixed"
+        records = self._read_csv(path) if file_format == "csv" else self._read_fixed_width(path, layout)
+
+        imported_at = datetime.now().isoformat()
+        rows = 0
+        batch = []
+        for record in records:
+            row = self._to_row(record, county, source, imported_at)
+            if row:
+                batch.append(row)
+            if len(batch) >= 5000:
+                rows += self._upsert(batch)
+                batch = []
+        rows += self._upsert(batch)
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO imports (source, county, size, mtime, rows, imported_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (source, county, stat.st_size, stat.st_mtime, rows, imported_at)
+        )
+        self.conn.commit()
+        return rows
+
+    def _read_csv(self, path):
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.DictReader(f)
+            header = {name.strip().lower(): name for name in reader.fieldnames or []}
+            # First accepted header name present in the file wins
+            columns = {}
+            for field, names in CSV_COLUMNS.items():
+                for name in names:
+                    if name in header:
+                        columns[field] = header[name]
+                        break
+            for line in reader:
+                yield {field: (line.get(column) or "").strip() for field, column in columns.items()}
+
+    def _read_fixed_width(self, path, layout=None):
+        layout = layout or TRUE_AUTOMATION_LAYOUT
+        with open(path, encoding="latin-1") as f:
+            for line in f:
+                yield {field: line[start - 1:end].strip() for field, (start, end) in layout.items()}
+
+    def _to_row(self, record, county, source, imported_at):
+        """Turn one export record into a parcels row (None if it has no APN)"""
+        # The property ID is not an APN - showing it as the Geographic ID would be wrong, so such rows are skipped
+        apn = record.get("geo_id")
+        if not apn:
+            return None
+
+        number = record.get("situs_num", "")
+        street = " ".join(filter(None, [record.get("situs_street_prefix"), record.get("situs_street")]))
+        situs_address = record.get("situs_address") or " ".join(filter(None, [
+            number, street, record.get("situs_street_suffix"), record.get("situs_unit"), record.get("situs_city")
+        ]))
+
+        # situs_key is "<number> <street name>", which is what users usually type ("306 Main")
+        situs_key = street_key(f"{number} {street}" if street else situs_address)
+        owner_name = record.get("owner_name", "")
+
+        return (
+            county.lower(), apn, record.get("prop_id"), situs_address, situs_key, full_key(situs_address),
+            owner_name, normalize_key(owner_name), record.get("legal_description"),
+            self._format_value(record.get("appraised_value")), source, imported_at
+        )
+
+    def _format_value(self, value):
+        """Exports store values as bare digits or decimals ("108240.00"); the app shows them as "$108,240\""""
+        try:
+            amount = Decimal(re.sub(r"[$,\s]", "", value or ""))
+        except InvalidOperation:
+            return None
+        if not amount.is_finite():
+            return None
+        if amount == amount.to_integral_value():
+            return f"${int(amount):,}"
+        return f"${amount:,.2f}"
+
+    def _upsert(self, batch):
+        # Export rows replace everything except the detail URL, which only harvesting knows
+        if batch:
+            self.conn.executemany("""
+                INSERT INTO parcels (county, apn, prop_id, situs_address, situs_key, full_key, owner_name,
+                                     owner_key, legal_description, appraised_value, source, imported_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (county, apn) DO UPDATE SET
+                    prop_id = excluded.prop_id, situs_address = excluded.situs_address,
+                    situs_key = excluded.situs_key, full_key = excluded.full_key,
+                    owner_name = excluded.owner_name, owner_key = excluded.owner_key,
+                    legal_description = excluded.legal_description, appraised_value = excluded.appraised_value,
+                    source = excluded.source, imported_at = excluded.imported_at
+            """, batch)
+        return len(batch)
+
+    def upsert_harvested(self, rows, county, source_url):
+        """
+        Upsert rows harvested from a CAD search-results page
+        Args:
+            rows: Dicts with apn, prop_id, situs_address, owner_name and detail_url (any may be empty but apn)
+            county: County the results page belongs to
+            source_url: Results page URL, stored as the rows' provenance
+        Returns the number of rows upserted
+        """
+        harvested_at = datetime.now().isoformat()
+        batch = []
+        for row in rows:
+            if not row.get("apn"):
+                continue
+            situs_address = row.get("situs_address") or ""
+            owner_name = row.get("owner_name") or ""
+            batch.append((
+                county.lower(), row["apn"], row.get("prop_id"), situs_address,
+                street_key(situs_address), full_key(situs_address), owner_name, normalize_key(owner_name),
+                f"harvest:{source_url}", harvested_at, row.get("detail_url")
+            ))
+
+        # A results row never has the legal description or value, so never blank out what an export set
+        self.conn.executemany("""
+            INSERT INTO parcels (county, apn, prop_id, situs_address, situs_key, full_key, owner_name,
+                                 owner_key, source, imported_at, detail_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (county, apn) DO UPDATE SET
+                prop_id = COALESCE(excluded.prop_id, parcels.prop_id),
+                situs_address = COALESCE(NULLIF(excluded.situs_address, ''), parcels.situs_address),
+                situs_key = COALESCE(NULLIF(excluded.situs_key, ''), parcels.situs_key),
+                full_key = COALESCE(NULLIF(excluded.full_key, ''), parcels.full_key),
+                owner_name = COALESCE(NULLIF(excluded.owner_name, ''), parcels.owner_name),
+                owner_key = COALESCE(NULLIF(excluded.owner_key, ''), parcels.owner_key),
+                detail_url = COALESCE(excluded.detail_url, parcels.detail_url)
+        """, batch)
+        self.conn.commit()
+        return len(batch)
+
+    def update_fields(self, county, apn, fields, commit=True):
+        """Store fields re-read from a parcel's detail page (owner, value, legal description, detail URL)"""
+        owner_name = fields.get("owner")
+        self.conn.execute("""
+            UPDATE parcels SET
+                owner_name = COALESCE(?, owner_name),
+                owner_key = COALESCE(?, owner_key),
+                appraised_value = COALESCE(?, appraised_value),
+                legal_description = COALESCE(?, legal_description),
+                detail_url = COALESCE(?, detail_url)
+            WHERE county = ? AND apn = ?
+        """, (
+            owner_name, normalize_key(owner_name) if owner_name else None, fields.get("appraised_value"),
+            fields.get("legal_description"), fields.get("detail_url"), county.lower(), apn
+        ))
+        if commit:
+            self.conn.commit()
+
+    # ------------------------------------------------------------------ lookups
+
+    def lookup_address(self, address, county):
+        """All parcels whose situs matches the typed address (exact street key, or full-address prefix)"""
+        key = street_key(address)
+        if not key:
+            return []
+
+        rows = self.conn.execute(
+            "SELECT * FROM parcels WHERE county = ? AND situs_key = ?", (county.lower(), key)
+        ).fetchall()
+        if not rows:
+            # Range scan on the full-address index instead of LIKE so the index is used
+            prefix = full_key(address)
+            rows = self.conn.execute(
+                "SELECT * FROM parcels WHERE county = ? AND full_key >= ? AND full_key < ?",
+                (county.lower(), prefix, prefix + "\uffff")
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def lookup_apn(self, apn):
+        row = self.conn.execute("SELECT * FROM parcels WHERE apn = ?", (apn,)).fetchone()
+        return dict(row) if row else None
+
+    def lookup_owner(self, owner_name, county=None):
+        query = "SELECT * FROM parcels WHERE owner_key = ?"
+        params = [normalize_key(owner_name)]
+        if county:
+            query += " AND county = ?"
+            params.append(county.lower())
+        return [dict(row) for row in self.conn.execute(query, params).fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import appraisal-roll exports into the local parcel index")
+    parser.add_argument("files", nargs="+", help="CSV or fixed-width export files")
+    parser.add_argument("--county", required=True, help="County the exports belong to (e.g. Bee)")
+    parser.add_argument("--format", choices=["csv", "fixed"], help="Export format (guessed from extension)")
+    parser.add_argument("--index", default=PARCEL_INDEX_PATH, help="Index file path")
+    parser.add_argument("--force", action="store_true", help="Re-import unchanged files")
+    args = parser.parse_args()
+
+    index = ParcelIndex(args.index)
+    for path in args.files:
+        start = time.time()
+        rows = index.import_file(path, args.county, file_format=args.format, force=args.force)
+        if rows:
+            print(f"✅ Imported {rows} parcels from {path} in {time.time() - start:.1f}s")
+        else:
+            print(f"⏭️ Skipped {path} (unchanged since last import)")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import io
+import os
+import json
+import time
+
+import zstandard
+
+RAW_RESULT_DIR = "logs/raw_results"
+
+# Characters shown per page in the debug view
+RAW_RESULT_PAGE_SIZE = 1000
+
+# Retention budget for transcripts: total compressed bytes and age, whichever is hit first
+MAX_RAW_RESULT_BYTES = 200 * 1024 * 1024
+MAX_RAW_RESULT_AGE = 30 * 24 * 3600
+
+
+class RawResultHandle:
+    """
+    Lightweight reference to an agent transcript written to a zstd-compressed side file
+    Nothing is loaded until a page is asked for, and a page only decompresses the stream up to
+    its end, so the result dict stays small however long the agents ran.
+    """
+
+    def __init__(self, path, length):
+        self.path = path
+        self.length = length  # characters in the transcript
+
+    def page_count(self, page_size=RAW_RESULT_PAGE_SIZE):
+        return max(1, -(-self.length // page_size))
+
+    def read_page(self, page=0, page_size=RAW_RESULT_PAGE_SIZE):
+        """Text of one page (0-based)"""
+        if not os.path.exists(self.path):
+            return "Raw result no longer available (removed by retention)"
+        with open(self.path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            text = io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
+            # Skip earlier pages in bounded reads instead of materializing them
+            remaining = page * page_size
+            while remaining > 0:
+                skipped = len(text.read(min(remaining, 64 * 1024)))
+                if not skipped:
+                    return ""
+                remaining -= skipped
+            return text.read(page_size)
+
+    def to_dict(self):
+        return {"path": self.path, "length": self.length}
+
+    def __str__(self):
+        return f"RawResultHandle({self.path}, {self.length} chars)"
+
+
+def _step_record(step, item):
+    """One agent step without its screenshot (screenshots are kept by the screenshot store)"""
+    record = item.model_dump()
+    record["state"].pop("screenshot", None)
+    return {"step": step, **record}
+
+
+def write_raw_result(sections, name="agent", raw_dir=RAW_RESULT_DIR):
+    """
+    Stream agent transcripts to a compressed side file, one step at a time
+    sections: list of (title, AgentHistoryList) pairs; a history of None is skipped
+    Returns a RawResultHandle.
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    path = os.path.join(raw_dir, f"{name}_{time.time_ns()}.txt.zst")
+
+    length = 0
+    with open(path, 'wb') as f:
+        with zstandard.ZstdCompressor(level=6).stream_writer(f) as writer:
+            def write(text):
+                nonlocal length
+                writer.write(text.encode("utf-8"))
+                length += len(text)
+
+            for title, history in sections:
+                if history is None:
+                    continue
+                write(f"===== {title} =====\n")
+                write(f"Final result: {history.final_result()}\n")
+                for step, item in enumerate(history.history, 1):
+                    write(json.dumps(_step_record(step, item), default=str) + "\n")
+                write("\n")
+
+    sweep_raw_results(raw_dir)
+    return RawResultHandle(path, length)
+
+
+def sweep_raw_results(raw_dir=RAW_RESULT_DIR, max_bytes=MAX_RAW_RESULT_BYTES, max_age=MAX_RAW_RESULT_AGE):
+    """Delete transcripts, oldest first, past max_age or beyond the newest max_bytes; the newest is always kept"""
+    if not os.path.isdir(raw_dir):
+        return 0
+    paths = sorted(
+        (os.path.join(raw_dir, name) for name in os.listdir(raw_dir) if name.endswith(".zst")),
+        key=os.path.getmtime,
+        reverse=True
+    )
+
+    now = time.time()
+    kept_bytes = 0
+    removed = 0
+    for index, path in enumerate(paths):
+        try:
+            kept_bytes += os.path.getsize(path)
+            if index > 0 and (now - os.path.getmtime(path) > max_age or kept_bytes > max_bytes):
+                os.remove(path)
+                removed += 1
+        except OSError:
+            # Already removed by another session's sweep
+            continue
+    return removed
@@ -0,0 +1,114 @@
+import os
+import json
+from fnmatch import fnmatch
+from urllib.parse import urlsplit
+from collections import defaultdict
+
+REQUEST_BLOCKING_FILE = "data/request_blocking.json"
+
+# Rules per request host ("*" applies everywhere; a domain also covers its subdomains).
+# block_types are Playwright resource types; block/allow patterns are fnmatch globs on the full URL,
+# and allow patterns win over every block rule. Documents are never blocked.
+DEFAULT_RULES = {
+    "*": {
+        "block_types": ["font", "media"],
+        "block_patterns": [
+            "*google-analytics.com/*",
+            "*googletagmanager.com/*",
+            "*doubleclick.net/*",
+            "*googlesyndication.com/*",
+            "*connect.facebook.net/*",
+            "*hotjar.com/*",
+            "*clarity.ms/*",
+            "*newrelic.com/*",
+            "*nr-data.net/*",
+            "*quantserve.com/*",
+            "*scorecardresearch.com/*",
+        ],
+        "allow_patterns": [],
+    },
+    # netronline is only a directory of links - the agent never needs its pictures or ads
+    "netronline.com": {
+        "block_types": ["image"],
+        "block_patterns": ["*/ads/*", "*adserver*"],
+        "allow_patterns": [],
+    },
+}
+
+# Typical transfer sizes, used to estimate what blocked requests would have cost
+TYPICAL_BYTES = {
+    "font": 40_000,
+    "media": 500_000,
+    "image": 30_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_TYPICAL_BYTES = 10_000
+
+
+def load_rules(rules_file=REQUEST_BLOCKING_FILE):
+    """DEFAULT_RULES, with domains from the optional rules file replacing or adding entries"""
+    rules = {domain: dict(rule) for domain, rule in DEFAULT_RULES.items()}
+    if os.path.exists(rules_file):
+        try:
+            with open(rules_file, 'r') as f:
+                rules.update(json.load(f))
+        except Exception as e:
+            print(f"Failed to load request blocking rules: {e}")
+    return rules
+
+
+class RequestBlocker:
+    """Aborts ads, trackers, fonts and heavy media before they load, per domain and resource type"""
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else load_rules()
+        self.blocked = defaultdict(int)
+        self.blocked_bytes = 0
+        self.allowed = 0
+
+    async def install(self, browser_session):
+        # Routes registered last run first, so this sees requests before the HTTP cache;
+        # allowed requests fall back to it (or to the network)
+        await browser_session.browser_context.route("**/*", self.handle)
+
+    def rules_for(self, host):
+        """Rules that apply to a host: the global rule plus every matching domain rule"""
+        return [
+            rule for domain, rule in self.rules.items()
+            if domain == "*" or host == domain or host.endswith("." + domain)
+        ]
+
+    def should_block(self, url, resource_type):
+        if resource_type == "document":
+            return False
+
+        rules = self.rules_for(urlsplit(url).hostname or "")
+        if any(fnmatch(url, pattern) for rule in rules for pattern in rule.get("allow_patterns", [])):
+            return False
+        return any(
+            resource_type in rule.get("block_types", [])
+            or any(fnmatch(url, pattern) for pattern in rule.get("block_patterns", []))
+            for rule in rules
+        )
+
+    async def handle(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] += 1
+            self.blocked_bytes += TYPICAL_BYTES.get(request.resource_type, DEFAULT_TYPICAL_BYTES)
+            await route.abort("blockedbyclient")
+            return
+
+        self.allowed += 1
+        await route.fallback()
+
+    def stats(self):
+        return {
+            "blocked": dict(self.blocked),
+            "blocked_total": sum(self.blocked.values()),
+            "estimated_blocked_bytes": self.blocked_bytes,
+            "allowed": self.allowed
+        }
@@ -0,0 +1,257 @@
+import io
+import os
+import json
+import base64
+import hashlib
+from datetime import datetime
+from collections import Counter
+
+from PIL import Image
+
+from image_pipeline import difference_hash
+
+SCREENSHOT_DIR = "data/screenshots"
+
+# Total blob bytes kept; the oldest lookups are dropped beyond this
+MAX_SCREENSHOT_BYTES = 1024 * 1024 * 1024
+
+# Frames within this Hamming distance of the previous kept frame are treated as unchanged
+DEDUP_DISTANCE = 3
+
+THUMBNAIL_SIZE = (320, 200)
+
+# Unreferenced blobs younger than this may belong to a lookup whose manifest is still being written
+ORPHAN_GRACE_SECONDS = 300
+
+# A pending manifest (frames spilled by a lookup still running) this old belongs to a lookup that died
+PENDING_MANIFEST_MAX_AGE = 24 * 3600
+PENDING_SUFFIX = ".pending.json"
+
+
+def _extension(data):
+    return "jpg" if data[:3] == b"\xff\xd8\xff" else "png"
+
+
+class ScreenshotStore:
+    """
+    Audit store for agent screenshots
+    blobs/ab/<sha256>.<ext> holds each distinct image once, however many lookups show it.
+    manifests/<lookup_id>.json lists a lookup's frames in order; a frame that looks the same as
+    the previous one (perceptual hash) only references the earlier blob. Thumbnails for the
+    history view are made on first request and cached in thumbs/.
+    """
+
+    def __init__(self, store_dir=SCREENSHOT_DIR, max_bytes=MAX_SCREENSHOT_BYTES, dedup_distance=DEDUP_DISTANCE):
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self.dedup_distance = dedup_distance
+        self.blobs_dir = os.path.join(store_dir, "blobs")
+        self.manifests_dir = os.path.join(store_dir, "manifests")
+        self.thumbs_dir = os.path.join(store_dir, "thumbs")
+
+    def blob_path(self, digest, extension):
+        return os.path.join(self.blobs_dir, digest[:2], f"{digest}.{extension}")
+
+    def pending_path(self, lookup_id):
+        return os.path.join(self.manifests_dir, lookup_id + PENDING_SUFFIX)
+
+    def _write_json(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, path)
+
+    def _put_blob(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        extension = _extension(data)
+        path = self.blob_path(digest, extension)
+        if os.path.exists(path):
+            # Reused: refresh its age so retention's orphan grace applies until a manifest references it
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest, extension
+
+    def save_lookup(self, lookup_id, frames):
+        """
+        Store one lookup's frames and write its manifest
+        frames: dicts with "image" (bytes or base64 str) plus any context (step, url, label)
+        Returns a summary to keep on the search record.
+        """
+        entries = []
+        last_kept = None
+        for frame in frames:
+            if frame.get("blob"):
+                # Spilled to the store during the run (see spill); only the manifest entry is left to write
+                data = None
+                frame_hash = int(frame["dhash"], 16)
+                entry = dict(frame)
+            else:
+                image = frame.get("image")
+                if not image:
+                    continue
+                data = base64.b64decode(image) if isinstance(image, str) else image
+                try:
+                    frame_hash = difference_hash(Image.open(io.BytesIO(data)))
+                except Exception as e:
+                    print(f"Skipping unreadable screenshot: {e}")
+                    continue
+
+                entry = {key: value for key, value in frame.items() if key != "image"}
+                entry["dhash"] = f"{frame_hash:016x}"
+
+            if last_kept is not None and bin(frame_hash ^ last_kept["hash"]).count("1") <= self.dedup_distance:
+                # Unchanged page - reference the frame already kept instead of storing another blob
+                entry["blob"], entry["ext"] = last_kept["blob"], last_kept["ext"]
+                entry["duplicate"] = True
+            else:
+                if data is not None:
+                    entry["blob"], entry["ext"] = self._put_blob(data)
+                entry["duplicate"] = False
+                last_kept = {"hash": frame_hash, "blob": entry["blob"], "ext": entry["ext"]}
+            entries.append(entry)
+
+        if not entries:
+            self._drop_pending(lookup_id)
+            return None
+
+        manifest = {"lookup_id": lookup_id, "saved_at": datetime.now().isoformat(), "frames": entries}
+        self._write_json(os.path.join(self.manifests_dir, f"{lookup_id}.json"), manifest)
+        self._drop_pending(lookup_id)
+
+        self.enforce_retention()
+        return {
+            "lookup_id": lookup_id,
+            "frames": len(entries),
+            "kept": sum(1 for entry in entries if not entry["duplicate"])
+        }
+
+    def spill(self, frame, lookup_id):
+        """
+        Store one frame's image now, before its lookup is saved, and return the frame without it
+        The result can be passed to save_lookup in place of the original frame; None if unreadable.
+        Until save_lookup runs, a pending manifest for lookup_id keeps the image from being treated
+        as an orphan by retention in this or any other process.
+        """
+        image = frame["image"]
+        data = base64.b64decode(image) if isinstance(image, str) else image
+        try:
+            frame_hash = difference_hash(Image.open(io.BytesIO(data)))
+        except Exception as e:
+            print(f"Skipping unreadable screenshot: {e}")
+            return None
+        entry = {key: value for key, value in frame.items() if key != "image"}
+        entry["dhash"] = f"{frame_hash:016x}"
+        entry["blob"], entry["ext"] = self._put_blob(data)
+
+        pending_path = self.pending_path(lookup_id)
+        pending = {"lookup_id": lookup_id, "frames": []}
+        if os.path.exists(pending_path):
+            with open(pending_path, 'r') as f:
+                pending = json.load(f)
+        pending["frames"].append(entry)
+        self._write_json(pending_path, pending)
+        return entry
+
+    def _drop_pending(self, lookup_id):
+        if os.path.exists(self.pending_path(lookup_id)):
+            os.remove(self.pending_path(lookup_id))
+
+    def load_manifest(self, lookup_id):
+        path = os.path.join(self.manifests_dir, f"{lookup_id}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def thumbnail(self, digest, extension):
+        """Path of a JPEG thumbnail for a blob, created on first use; None if the blob is gone"""
+        thumb_path = os.path.join(self.thumbs_dir, f"{digest}.jpg")
+        if os.path.exists(thumb_path):
+            return thumb_path
+
+        blob_path = self.blob_path(digest, extension)
+        if not os.path.exists(blob_path):
+            return None
+        os.makedirs(self.thumbs_dir, exist_ok=True)
+        with Image.open(blob_path) as image:
+            image = image.convert("RGB")
+            image.thumbnail(THUMBNAIL_SIZE)
+            image.save(thumb_path, format="JPEG", quality=70)
+        return thumb_path
+
+    def enforce_retention(self):
+        """Drop the oldest manifests until the blobs they keep alive fit in max_bytes, then delete orphans"""
+        if not os.path.isdir(self.manifests_dir):
+            return
+
+        now = datetime.now().timestamp()
+        manifests = []
+        pending = []
+        for name in os.listdir(self.manifests_dir):
+            path = os.path.join(self.manifests_dir, name)
+            if name.endswith(PENDING_SUFFIX):
+                if now - os.path.getmtime(path) > PENDING_MANIFEST_MAX_AGE:
+                    os.remove(path)
+                else:
+                    pending.append(path)
+            elif name.endswith(".json"):
+                manifests.append(path)
+        manifests.sort(key=os.path.getmtime)
+        blob_files = {}
+        for root, _, files in os.walk(self.blobs_dir):
+            for name in files:
+                blob_files[name.split(".")[0]] = os.path.join(root, name)
+
+        # Reference counts let the oldest manifests be dropped one by one without rereading the rest
+        manifest_blobs = []
+        references = Counter()
+        for path in manifests:
+            with open(path, 'r') as f:
+                digests = {frame["blob"] for frame in json.load(f)["frames"]}
+            manifest_blobs.append((path, digests))
+            references.update(digests)
+
+        # Frames spilled by lookups still running are live, but never dropped to make room
+        protected = set()
+        for path in pending:
+            try:
+                with open(path, 'r') as f:
+                    protected.update(frame["blob"] for frame in json.load(f)["frames"])
+            except (OSError, ValueError):
+                continue
+
+        def blob_size(digest):
+            return os.path.getsize(blob_files[digest]) if digest in blob_files else 0
+
+        total = sum(blob_size(digest) for digest in references)
+        while total > self.max_bytes and len(manifest_blobs) > 1:
+            path, digests = manifest_blobs.pop(0)
+            os.remove(path)
+            for digest in digests:
+                references[digest] -= 1
+                if references[digest] == 0:
+                    del references[digest]
+                    total -= blob_size(digest)
+
+        live = set(references) | protected
+        for digest, path in blob_files.items():
+            if digest not in live and now - os.path.getmtime(path) > ORPHAN_GRACE_SECONDS:
+                os.remove(path)
+                thumb_path = os.path.join(self.thumbs_dir, f"{digest}.jpg")
+                if os.path.exists(thumb_path):
+                    os.remove(thumb_path)
+
+
+def agent_frames(agent, label):
+    """Screenshots an agent's history recorded, one frame per step"""
+    return [
+        {"image": item.state.screenshot, "step": step, "url": item.state.url, "label": label}
+        for step, item in enumerate(agent.state.history.history, 1)
+        if item.state and item.state.screenshot
+    ]
@@ -0,0 +1,124 @@
+import re
+import hashlib
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from parcel_index import ParcelIndex
+
+# Results-table header names (lower-case, no colon) for each harvested field
+RESULT_COLUMNS = {
+    "apn": ["geographic id", "geo id", "apn", "parcel number", "parcel id"],
+    "prop_id": ["property id", "prop id", "account", "account number"],
+    "situs_address": ["property address", "situs address", "situs", "address"],
+    "owner_name": ["owner name", "owner", "name"],
+}
+
+
+class ResultsTableParser(HTMLParser):
+    """Collects every table as a header row plus data rows (cell texts and the first link of each row)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._tables = []   # stack of open tables: {"header": [...], "rows": [...]}
+        self._row = None    # {"cells": [...], "is_header": bool, "href": str}
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._tables.append({"header": None, "rows": []})
+        elif tag == "tr" and self._tables:
+            self._row = {"cells": [], "is_header": False, "href": None}
+        elif tag in ("th", "td") and self._row is not None:
+            self._cell = []
+            if tag == "th":
+                self._row["is_header"] = True
+        elif tag == "a" and self._row is not None and self._row["href"] is None:
+            self._row["href"] = dict(attrs).get("href")
+
+    def handle_endtag(self, tag):
+        if tag in ("th", "td") and self._cell is not None and self._row is not None:
+            self._row["cells"].append(re.sub(r"\s+", " ", " ".join(self._cell)).strip())
+            self._cell = None
+        elif tag == "tr" and self._row is not None and self._tables:
+            table = self._tables[-1]
+            # The first row (or any all-<th> row before data) names the columns
+            if table["header"] is None and (self._row["is_header"] or not table["rows"]):
+                table["header"] = [cell.lower().rstrip(":").strip() for cell in self._row["cells"]]
+            else:
+                table["rows"].append(self._row)
+            self._row = None
+        elif tag == "table" and self._tables:
+            self.tables.append(self._tables.pop())
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def _column_map(header):
+    """Map harvested fields to column positions, or None if this is not a results table"""
+    columns = {}
+    for field, names in RESULT_COLUMNS.items():
+        for position, title in enumerate(header):
+            if title in names:
+                columns[field] = position
+                break
+    # A results table needs the Geographic ID and an address to be worth keeping
+    if "situs_address" not in columns or "apn" not in columns:
+        return None
+    return columns
+
+
+def harvest_results(html, page_url):
+    """Every row of every search-results table on a page, as dicts with absolute detail URLs"""
+    parser = ResultsTableParser()
+    parser.feed(html)
+    parser.close()
+
+    harvested = []
+    for table in parser.tables:
+        columns = _column_map(table["header"] or [])
+        if not columns:
+            continue
+        for row in table["rows"]:
+            cells = row["cells"]
+            record = {field: cells[position] for field, position in columns.items() if position < len(cells)}
+            record["detail_url"] = urljoin(page_url, row["href"]) if row["href"] else None
+            if record.get("apn") and record.get("situs_address"):
+                harvested.append(record)
+    return harvested
+
+
+class SearchResultsHarvester:
+    """on_step_end hook that upserts every search-results row the agent sees into the parcel index"""
+
+    def __init__(self, county):
+        self.county = county
+        self.rows_harvested = 0
+        self._seen_pages = set()
+
+    async def on_step_end(self, agent):
+        try:
+            page = await agent.browser_session.get_current_page()
+            html = await page.content()
+        except Exception as e:
+            print(f"Search harvester could not read page: {e}")
+            return
+
+        # Scrolling or waiting steps leave the page unchanged - parse each version only once
+        fingerprint = hashlib.sha1(html.encode("utf-8", "replace")).hexdigest()
+        if fingerprint in self._seen_pages:
+            return
+        self._seen_pages.add(fingerprint)
+
+        rows = harvest_results(html, page.url)
+        if not rows:
+            return
+
+        parcel_index = ParcelIndex()
+        try:
+            self.rows_harvested += parcel_index.upsert_harvested(rows, self.county, page.url)
+        finally:
+            parcel_index.close()
+        print(f"Harvested {len(rows)} search-result rows from {page.url}")
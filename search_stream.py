@@ -0,0 +1,40 @@
+import asyncio
+
+# Partial results search_apn_stream() yields, in pipeline order
+SEARCH_STAGES = {
+    "county_resolved": "🗺️ County appraisal district site found",
+    "detail_url": "🔗 Property detail page found",
+    "apn_found": "🆔 APN found",
+    "legal_description": "📜 Legal description read",
+    "match_verdict": "🔍 Verification verdict",
+}
+
+
+async def drain_events(events, task):
+    """Yield events queued by step hooks while a task runs; ends once the task is done and the queue is empty"""
+    while True:
+        getter = asyncio.ensure_future(events.get())
+        done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+        if getter in done:
+            yield getter.result()
+            continue
+
+        getter.cancel()
+        while not events.empty():
+            yield events.get_nowait()
+        return
+
+
+def verification_events(result, include_apn=False):
+    """Stage events for a result that was produced in one go (e.g. answered from the parcel index)"""
+    stage_events = []
+    if include_apn and result.get("search_status") == "SUCCESS":
+        stage_events.append({"stage": "apn_found", "data": result})
+    if "verification_info" in result:
+        stage_events.append({"stage": "legal_description", "data": {"verification_info": result["verification_info"]}})
+    if "is_semantic_match" in result:
+        stage_events.append({"stage": "match_verdict", "data": {
+            "verification_prompt": result.get("verification_prompt"),
+            "is_semantic_match": result["is_semantic_match"]
+        }})
+    return stage_events
@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime
+from multiprocessing import Pool
+
+import zstandard
+
+from detail_extractor import extract_detail_fields
+from parcel_index import ParcelIndex, PARCEL_INDEX_PATH
+
+SNAPSHOT_DIR = "data/snapshots"
+SEARCH_HISTORY_FILE = "logs/apn_search_history.json"
+
+# HTML compresses ~10x at this level; screenshots are already compressed and use a cheap level
+HTML_COMPRESSION_LEVEL = 12
+SCREENSHOT_COMPRESSION_LEVEL = 1
+
+
+class SnapshotStore:
+    """
+    Content-addressed, zstd-compressed store of visited detail pages
+    objects/ab/abcdef....zst holds one page (or screenshot) keyed by the sha256 of its content,
+    so revisiting an unchanged page stores nothing new. manifest.jsonl links every capture
+    to the lookup it came from (county, APN, address, URL).
+    """
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR):
+        self.snapshot_dir = snapshot_dir
+        self.objects_dir = os.path.join(snapshot_dir, "objects")
+        self.manifest_path = os.path.join(snapshot_dir, "manifest.jsonl")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + ".zst")
+
+    def put(self, data, level=HTML_COMPRESSION_LEVEL):
+        """Store bytes once and return their sha256"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so a crash never leaves a truncated object under its final name
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor(level=level).compress(data))
+        os.replace(temp_path, path)
+        return digest
+
+    def get(self, digest):
+        """Decompressed bytes of a stored object"""
+        return read_object(self.object_path(digest))
+
+    def save(self, html, url, county, apn, address=None, screenshot=None):
+        """
+        Store a detail page (and optionally its PNG screenshot) and record the capture
+        Returns the snapshot reference to keep on the search record
+        """
+        snapshot = {
+            "html": self.put(html.encode("utf-8")),
+            "screenshot": self.put(screenshot, level=SCREENSHOT_COMPRESSION_LEVEL) if screenshot else None,
+            "url": url,
+            "county": county.lower(),
+            "apn": apn,
+            "address": address,
+            "captured_at": datetime.now().isoformat()
+        }
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with open(self.manifest_path, 'a') as f:
+            f.write(json.dumps(snapshot) + "\n")
+        return snapshot
+
+    def captures(self):
+        """Every recorded capture, oldest first"""
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def write_manifest(self, captures):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            for capture in captures:
+                f.write(json.dumps(capture) + "\n")
+        os.replace(temp_path, self.manifest_path)
+
+
+def read_object(path):
+    with open(path, 'rb') as f:
+        return zstandard.ZstdDecompressor().decompress(f.read())
+
+
+def _extract_object(path):
+    """Pool worker: rerun the current detail parsers over one stored page"""
+    try:
+        return extract_detail_fields(html=read_object(path).decode("utf-8", "replace"))
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def reextract(store=None, index_path=PARCEL_INDEX_PATH, history_file=SEARCH_HISTORY_FILE, processes=None):
+    """
+    Rerun the detail parsers over every stored snapshot and update the records in place:
+    the manifest, the parcel index rows and the matching search-history entries.
+    Each distinct page is parsed once, however many captures point at it.
+    """
+    store = store or SnapshotStore()
+    captures = store.captures()
+    digests = list(dict.fromkeys(capture["html"] for capture in captures))
+    paths = [store.object_path(digest) for digest in digests]
+
+    if len(paths) > 1 and processes != 1:
+        with Pool(processes) as pool:
+            results = pool.map(_extract_object, paths, chunksize=max(1, len(paths) // 64))
+    else:
+        results = [_extract_object(path) for path in paths]
+    fields_by_digest = dict(zip(digests, results))
+
+    extracted_at = datetime.now().isoformat()
+    for capture in captures:
+        capture["fields"] = fields_by_digest[capture["html"]]
+        capture["extracted_at"] = extracted_at
+    store.write_manifest(captures)
+
+    # Latest capture per parcel wins in the index
+    latest = {}
+    for capture in captures:
+        if capture.get("apn") and "error" not in capture["fields"]:
+            latest[(capture["county"], capture["apn"])] = capture
+
+    parcel_index = ParcelIndex.open_existing(index_path)
+    if parcel_index is not None:
+        try:
+            for (county, apn), capture in latest.items():
+                parcel_index.update_fields(county, apn, {**capture["fields"], "detail_url": capture["url"]}, commit=False)
+            parcel_index.conn.commit()
+        finally:
+            parcel_index.close()
+
+    history_updated = _update_history(fields_by_digest, history_file)
+
+    errors = sum(1 for fields in results if "error" in fields)
+    return {"captures": len(captures), "pages": len(digests), "errors": errors, "history_updated": history_updated}
+
+
+def _update_history(fields_by_digest, history_file):
+    """Refresh the fields of search-history entries that carry a snapshot reference"""
+    if not os.path.exists(history_file):
+        return 0
+    with open(history_file, 'r') as f:
+        history = json.load(f)
+
+    updated = 0
+    for search in history:
+        fields = fields_by_digest.get((search.get("snapshot") or {}).get("html"))
+        if not fields or "error" in fields:
+            continue
+        for field in ("owner", "appraised_value"):
+            if fields.get(field):
+                search[field] = fields[field]
+        search["detail_fields"] = fields
+        updated += 1
+
+    if updated:
+        with open(history_file, 'w') as f:
+            json.dump(history, f, indent=2)
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detail-page snapshot store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reextract_parser = subparsers.add_parser("reextract", help="Rerun the current parsers over all stored snapshots")
+    reextract_parser.add_argument("--processes", type=int, help="Worker processes (default: one per CPU)")
+    reextract_parser.add_argument("--index", default=PARCEL_INDEX_PATH, help="Index file path")
+
+    subparsers.add_parser("stats", help="Show store size")
+
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="Snapshot directory")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.dir)
+
+    if args.command == "stats":
+        captures = store.captures()
+        stored_bytes = 0
+        objects = 0
+        for root, _, files in os.walk(store.objects_dir):
+            for name in files:
+                stored_bytes += os.path.getsize(os.path.join(root, name))
+                objects += 1
+        print(f"📦 {len(captures)} captures, {objects} stored objects, {stored_bytes / 1024 / 1024:.1f} MB on disk")
+        return 0
+
+    start = time.time()
+    summary = reextract(store, index_path=args.index, processes=args.processes)
+    elapsed = time.time() - start
+    print(
+        f"✅ Re-extracted {summary['pages']} pages ({summary['captures']} captures) in {elapsed:.1f}s "
+        f"({summary['pages'] / max(elapsed, 1e-6):.0f} pages/s), "
+        f"{summary['errors']} errors, {summary['history_updated']} history entries updated"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
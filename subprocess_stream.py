@@ -0,0 +1,103 @@
+import os
+import time
+import selectors
+import subprocess
+from datetime import datetime
+
+# Bytes read from a pipe per wakeup
+READ_CHUNK = 64 * 1024
+
+# Lines are handed to the consumer in batches at most this far apart (seconds) or this large
+BATCH_INTERVAL = 0.25
+MAX_BATCH_LINES = 500
+
+
+class SubprocessStreamer:
+    """
+    Runs a child process and reads its stdout and stderr concurrently
+    A selector waits on both pipes, so a quiet pipe never stalls the other one and neither pipe
+    buffer can fill up and block the child. Lines are tagged with their stream and a timestamp
+    and handed out in batches. The pipes are only read when the consumer asks for the next
+    batch, so a slow consumer slows the child down through the pipe instead of growing memory.
+    """
+
+    def __init__(self, args, env=None, cwd=None):
+        self.args = args
+        self.process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            env=env,
+            cwd=cwd
+        )
+        self.line_counts = {"out": 0, "err": 0}
+
+    def batches(self, batch_interval=BATCH_INTERVAL, max_batch_lines=MAX_BATCH_LINES):
+        """Yield lists of (stream, timestamp, line) until the child exits and both pipes are drained"""
+        selector = selectors.DefaultSelector()
+        partial = {}
+        for name, pipe in (("out", self.process.stdout), ("err", self.process.stderr)):
+            os.set_blocking(pipe.fileno(), False)
+            selector.register(pipe, selectors.EVENT_READ, name)
+            partial[name] = b""
+
+        batch = []
+        batch_started = time.monotonic()
+        try:
+            while selector.get_map():
+                timeout = max(0, batch_started + batch_interval - time.monotonic()) if batch else batch_interval
+                for key, _ in selector.select(timeout):
+                    name = key.data
+                    chunk = os.read(key.fd, READ_CHUNK)
+                    if not chunk:
+                        # EOF on this pipe; keep its unterminated last line
+                        selector.unregister(key.fileobj)
+                        if partial[name]:
+                            batch.append(self._line(name, partial[name]))
+                            partial[name] = b""
+                        continue
+
+                    *lines, partial[name] = (partial[name] + chunk).split(b"\n")
+                    if not batch:
+                        batch_started = time.monotonic()
+                    batch.extend(self._line(name, line) for line in lines)
+
+                if batch and (len(batch) >= max_batch_lines or time.monotonic() - batch_started >= batch_interval):
+                    yield batch
+                    batch = []
+        finally:
+            selector.close()
+
+        if batch:
+            yield batch
+        self.process.wait()
+
+    def _line(self, name, raw):
+        self.line_counts[name] += 1
+        return name, datetime.now(), raw.decode("utf-8", "replace").rstrip("\r")
+
+    @property
+    def returncode(self):
+        return self.process.returncode
+
+    def terminate(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+
+
+def format_line(stream, timestamp, line):
+    """One display line, e.g. '12:00:01.123 [err] Traceback ...'"""
+    tag = " [err]" if stream == "err" else ""
+    return f"{timestamp.strftime('%H:%M:%S.%f')[:-3]}{tag} {line}"
+
+
+def stream_to_live_output(args, live_output, **kwargs):
+    """Run a command and show its output in a LiveOutput as it arrives; returns the exit code"""
+    streamer = SubprocessStreamer(args, **kwargs)
+    try:
+        for batch in streamer.batches():
+            live_output.append("".join(format_line(*entry) + "\n" for entry in batch))
+    finally:
+        streamer.terminate()
+    return streamer.returncode
@@ -0,0 +1,68 @@
+from address_normalizer import parse_address, search_form_values, street_key, full_key
+
+
+def test_parse_simple_address_with_city():
+    parsed = parse_address("306 Main St, Tuleta")
+    assert parsed["number"] == "306"
+    assert parsed["street_name"] == "MAIN"
+    assert parsed["suffix"] == "ST"
+    assert parsed["city"] == "TULETA"
+
+
+def test_street_names_starting_with_a_suffix_are_kept():
+    # The old split/replace heuristics stripped "St" out of these names
+    assert parse_address("1200 Stone Rd")["street_name"] == "STONE"
+    assert parse_address("45 Stewart Ave")["street_name"] == "STEWART"
+    assert search_form_values("9 E Stone St")["street_name"] == "E STONE"
+
+
+def test_parse_directional_unit_state_and_zip():
+    parsed = parse_address("45 N Stewart Ave Apt 3B, Beeville, TX 78102")
+    assert parsed["predirectional"] == "N"
+    assert parsed["street_name"] == "STEWART"
+    assert parsed["suffix"] == "AVE"
+    assert parsed["unit"] == "APT 3B"
+    assert parsed["city"] == "BEEVILLE"
+    assert parsed["state"] == "TX"
+    assert parsed["zip"] == "78102"
+
+
+def test_search_form_values():
+    assert search_form_values("306 Main St, Tuleta") == {"street_number": "306", "street_name": "MAIN", "city": "TULETA"}
+    assert search_form_values("500 Old Stage Coach Trl")["street_name"] == "OLD STAGE COACH"
+
+
+def test_keys():
+    assert street_key("306 Main St, Tuleta") == "306 MAIN"
+    assert full_key("306 Main St, Tuleta") == "306 MAIN ST TULETA"
+
+
+def test_numbered_routes_keep_their_number_in_the_street_name():
+    assert search_form_values("1234 County Road 301")["street_name"] == "COUNTY ROAD 301"
+    assert search_form_values("1234 County Road 301")["city"] == ""
+
+    parsed = parse_address("100 US Highway 59, Beeville")
+    assert parsed["street_name"] == "US HIGHWAY 59"
+    assert parsed["suffix"] == ""
+    assert parsed["city"] == "BEEVILLE"
+
+    assert parse_address("1234 CR 301 Beeville")["street_name"] == "CR 301"
+    assert parse_address("1234 CR 301 Beeville")["city"] == "BEEVILLE"
+    assert parse_address("500 FM 1234 N")["street_name"] == "FM 1234"
+    assert parse_address("500 FM 1234 N")["postdirectional"] == "N"
+
+
+def test_route_words_without_a_number_are_ordinary_words():
+    assert parse_address("88 Road Runner Ln")["street_name"] == "ROAD RUNNER"
+    assert parse_address("45 Highway St")["street_name"] == "HIGHWAY"
+
+
+def test_unit_markers_need_an_identifier():
+    parsed = parse_address("12 Old Lot Rd")
+    assert parsed["street_name"] == "OLD LOT"
+    assert parsed["suffix"] == "RD"
+    assert parsed["unit"] == ""
+
+    assert parse_address("77 Main St Lot 4")["unit"] == "LOT 4"
+    assert parse_address("77 Main St # 5")["unit"] == "#5"
+    assert parse_address("9 Elm St Unit B, Beeville TX 78102")["unit"] == "UNIT B"
@@ -0,0 +1,49 @@
+from detail_extractor import extract_detail_fields, extract_fields_from_text
+
+
+def test_values_on_the_label_line_and_the_next_line():
+    fields = extract_fields_from_text(
+        "Geographic ID:\t57600-00030-05000-000000\n"
+        "Owner Name:\tVASQUEZ MARIA\n"
+        "Legal Description\n"
+        "TULETA BLK 3 LOTS 5 & 6\n"
+        "Appraised Value:\n\n$108,240\n"
+    )
+    assert fields == {
+        "apn_number": "57600-00030-05000-000000",
+        "owner": "VASQUEZ MARIA",
+        "legal_description": "TULETA BLK 3 LOTS 5 & 6",
+        "appraised_value": "$108,240",
+    }
+
+
+def test_empty_value_does_not_take_the_next_label():
+    fields = extract_fields_from_text("Legal Description:\nGeographic ID: 1\nSitus Address:\n")
+    assert "legal_description" not in fields
+    assert fields["apn_number"] == "1"
+
+    fields = extract_fields_from_text("Legal Description:\nSitus Address:\n306 MAIN ST")
+    assert "legal_description" not in fields
+
+
+def test_bare_name_label_matches_only_the_whole_label():
+    assert "owner" not in extract_fields_from_text("Name Change History\nNames on file: 2")
+    assert extract_fields_from_text("Name Change History\nName:\nJOHN DOE")["owner"] == "JOHN DOE"
+
+
+def test_label_followed_by_a_number():
+    assert extract_fields_from_text("Parcel Number 123-456")["apn_number"] == "123-456"
+
+
+def test_html_table_rows():
+    html = """
+        <table>
+          <tr><th>Geographic ID:</th><td>57600-00030-05000-000000</td></tr>
+          <tr><td>Legal Description:</td><td>TULETA BLK 3 LOTS 5 &amp; 6</td></tr>
+          <tr><td>Owner Name:</td><td>VASQUEZ MARIA</td></tr>
+        </table>
+    """
+    fields = extract_detail_fields(html=html)
+    assert fields["apn_number"] == "57600-00030-05000-000000"
+    assert fields["legal_description"] == "TULETA BLK 3 LOTS 5 & 6"
+    assert fields["owner"] == "VASQUEZ MARIA"
@@ -0,0 +1,49 @@
+import json
+
+from fuzzy_address import FuzzyAddressMatcher, load_history_entries
+
+
+def cached(apn):
+    return {"apn_number": apn, "origin": "result_cache"}
+
+
+def test_clear_winner_resolves():
+    matcher = FuzzyAddressMatcher()
+    matcher.add("306 MAIN ST TULETA", {"apn": "A1", "origin": "parcel_index"})
+    matcher.add("1200 STONE RD BEEVILLE", {"apn": "B2", "origin": "parcel_index"})
+    match = matcher.resolve("306 Main")
+    assert match is not None
+    assert match["entry"]["apn"] == "A1"
+
+
+def test_repeat_lookups_of_one_parcel_are_not_a_tie():
+    matcher = FuzzyAddressMatcher()
+    matcher.add("306 Main", cached("A1"))
+    matcher.add("306 Main", cached("A1"))
+    assert matcher.resolve("306 Main")["entry"]["apn_number"] == "A1"
+
+
+def test_index_row_and_cached_lookup_of_one_parcel_are_not_a_tie():
+    matcher = FuzzyAddressMatcher()
+    matcher.add("306 MAIN ST TULETA", {"apn": "A1", "origin": "parcel_index"})
+    matcher.add("306 Main", cached("A1"))
+    assert matcher.resolve("306 Main") is not None
+
+
+def test_near_tie_between_parcels_is_left_to_the_agent():
+    matcher = FuzzyAddressMatcher()
+    matcher.add("306 MAIN ST TULETA", {"apn": "A1", "origin": "parcel_index"})
+    matcher.add("306 MAIN ST BEEVILLE", {"apn": "B2", "origin": "parcel_index"})
+    assert matcher.resolve("306 Main St") is None
+
+
+def test_history_entries_without_county_are_ignored(tmp_path):
+    history_file = tmp_path / "history.json"
+    history_file.write_text(json.dumps([
+        {"address": "306 Main St", "apn_number": "OLD", "search_status": "SUCCESS"},
+        {"address": "306 Main St", "apn_number": "A1", "search_status": "SUCCESS", "county": "Bee"},
+        {"address": "9 Elm St", "apn_number": "C3", "search_status": "FAILED", "county": "Bee"},
+    ]))
+    entries = load_history_entries("bee", str(history_file))
+    assert [entry["apn_number"] for entry in entries] == ["A1"]
+    assert load_history_entries("Harris", str(history_file)) == []
@@ -0,0 +1,43 @@
+from log_capture import LogRing
+
+
+def test_reader_gets_only_new_output():
+    ring = LogRing(capacity=64)
+    ring.write("first\n")
+    text, cursor, dropped = ring.read_since(0)
+    assert (text, dropped) == ("first\n", 0)
+
+    ring.write("second\n")
+    text, cursor, dropped = ring.read_since(cursor)
+    assert (text, dropped) == ("second\n", 0)
+    assert ring.read_since(cursor) == ("", cursor, 0)
+
+
+def test_wrapped_output_reads_in_order():
+    ring = LogRing(capacity=8)
+    ring.write("abcdef")
+    _, cursor, _ = ring.read_since(0)
+    ring.write("ghij")
+    text, _, dropped = ring.read_since(cursor)
+    assert (text, dropped) == ("ghij", 0)
+
+
+def test_overwritten_output_is_reported_as_dropped():
+    ring = LogRing(capacity=8)
+    ring.write("abcdef")
+    ring.write("ghijkl")
+    text, cursor, dropped = ring.read_since(0)
+    assert (text, cursor, dropped) == ("efghijkl", 12, 4)
+
+
+def test_oversized_write_keeps_its_tail():
+    ring = LogRing(capacity=4)
+    ring.write("abcdefgh")
+    assert ring.read_since(0) == ("efgh", 8, 4)
+
+
+def test_clear_resets_the_cursor():
+    ring = LogRing(capacity=8)
+    ring.write("abc")
+    ring.clear()
+    assert ring.read_since(0) == ("", 0, 0)
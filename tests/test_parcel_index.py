@@ -0,0 +1,61 @@
+from parcel_index import ParcelIndex
+
+EXPORT = """prop_id,geo_id,owner_name,situs_num,situs_street,situs_street_suffix,situs_city,legal_desc,market value
+1001,57600-00030-05000-000000,VASQUEZ MARIA,306,MAIN,ST,TULETA,TULETA BLK 3 LOTS 5 & 6,108240.00
+1002,57600-00031-01000-000000,STONE JOHN,1200,STONE,RD,BEEVILLE,ABS 12 TR 4,"$95,000"
+"""
+
+
+def build_index(tmp_path):
+    export = tmp_path / "export.csv"
+    export.write_text(EXPORT)
+    parcel_index = ParcelIndex(str(tmp_path / "parcels.sqlite"))
+    rows = parcel_index.import_file(str(export), county="Bee")
+    return parcel_index, str(export), rows
+
+
+def test_import_and_lookup_by_address(tmp_path):
+    parcel_index, _, rows = build_index(tmp_path)
+    try:
+        assert rows == 2
+        parcels = parcel_index.lookup_address("306 Main St, Tuleta", "Bee")
+        assert len(parcels) == 1
+        assert parcels[0]["apn"] == "57600-00030-05000-000000"
+        assert parcels[0]["owner_name"] == "VASQUEZ MARIA"
+        assert parcels[0]["legal_description"] == "TULETA BLK 3 LOTS 5 & 6"
+        # Typed without the suffix or city, as users usually do
+        assert parcel_index.lookup_address("306 Main", "Bee")[0]["apn"] == "57600-00030-05000-000000"
+        assert parcel_index.lookup_address("1200 Stone Rd", "bee")[0]["owner_name"] == "STONE JOHN"
+        assert parcel_index.lookup_address("306 Main St", "Harris") == []
+    finally:
+        parcel_index.close()
+
+
+def test_values_are_parsed_as_decimals(tmp_path):
+    parcel_index, _, _ = build_index(tmp_path)
+    try:
+        assert parcel_index.lookup_apn("57600-00030-05000-000000")["appraised_value"] == "$108,240"
+        assert parcel_index.lookup_apn("57600-00031-01000-000000")["appraised_value"] == "$95,000"
+    finally:
+        parcel_index.close()
+
+
+def test_unchanged_export_is_skipped(tmp_path):
+    parcel_index, export, _ = build_index(tmp_path)
+    try:
+        assert parcel_index.import_file(export, county="Bee") == 0
+        assert parcel_index.import_file(export, county="Bee", force=True) == 2
+    finally:
+        parcel_index.close()
+
+
+def test_rows_without_geographic_id_are_skipped(tmp_path):
+    export = tmp_path / "export.csv"
+    export.write_text(EXPORT + "1003,,DOE JANE,9,ELM,ST,BEEVILLE,ABS 1,1000\n")
+    parcel_index = ParcelIndex(str(tmp_path / "parcels.sqlite"))
+    try:
+        assert parcel_index.import_file(str(export), county="Bee") == 2
+        assert parcel_index.lookup_apn("1003") is None
+        assert parcel_index.lookup_address("9 Elm St", "Bee") == []
+    finally:
+        parcel_index.close()
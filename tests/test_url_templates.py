@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from url_templates import DetailUrlTemplates, roll_year
+
+
+DETAIL_URL = "https://esearch.beecad.org/Property/View/9763?year=2024&ownerId=25544"
+
+
+def learned(tmp_path):
+    templates = DetailUrlTemplates(str(tmp_path / "templates.json"))
+    templates.learn("Bee", DETAIL_URL, {"prop_id": "9763", "owner_id": "25544"})
+    return templates
+
+
+def test_learn_replaces_identifiers_and_year(tmp_path):
+    templates = learned(tmp_path)
+    entry = templates.domains["esearch.beecad.org"]
+    assert entry["template"] == "https://esearch.beecad.org/Property/View/{prop_id}?year={year}&ownerId={owner_id}"
+    assert templates.counties["bee"] == "esearch.beecad.org"
+
+
+def test_learned_templates_are_saved(tmp_path):
+    learned(tmp_path)
+    reloaded = DetailUrlTemplates(str(tmp_path / "templates.json"))
+    assert reloaded.build("Bee", {"prop_id": "9763", "owner_id": "25544"}, year=2024) == DETAIL_URL
+
+
+def test_build_drops_query_placeholders_without_a_value(tmp_path):
+    templates = learned(tmp_path)
+    url = templates.build("Bee", {"prop_id": "1234"}, year=2025)
+    assert url == "https://esearch.beecad.org/Property/View/1234?year=2025"
+
+
+def test_build_needs_every_path_placeholder(tmp_path):
+    templates = learned(tmp_path)
+    assert templates.build("Bee", {"owner_id": "25544"}) is None
+    assert templates.build("Live Oak", {"prop_id": "1234"}) is None
+
+
+def test_url_without_identifiers_is_not_learned(tmp_path):
+    templates = DetailUrlTemplates(str(tmp_path / "templates.json"))
+    assert templates.learn("Bee", "https://esearch.beecad.org/Search?type=R", {"prop_id": "9763"}) is None
+    assert not (tmp_path / "templates.json").exists()
+
+
+def test_roll_year():
+    assert roll_year(DETAIL_URL, 2025) == DETAIL_URL.replace("2024", "2025")
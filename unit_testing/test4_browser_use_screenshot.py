@@ -1,6 +1,7 @@
 import streamlit as st
 import asyncio
 import os
+import sys
 import time
 from playwright.async_api import async_playwright
 from dotenv import load_dotenv
@@ -9,6 +10,10 @@ load_dotenv()
 from browser_use import Agent, BrowserSession
 from langchain_openai import ChatOpenAI
 
+# The live-view module lives in the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live_view import ScreencastView
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Browser-Use Screenshot Test", 
@@ -16,29 +21,29 @@ st.set_page_config(
     layout="wide"
 )
 
-# Create screenshots directory if it doesn't exist
-os.makedirs("screenshots", exist_ok=True)
-
 st.title("📸 Browser-Use Screenshot Test")
-st.markdown("### Testing screenshot capture with browser_use Agent")
+st.markdown("### Testing live browser view with browser_use Agent")
 
 async def run_agent_with_screenshots():
-    # Create progress indicators and screenshot area
+    # Create progress indicators and live view area
     progress_bar = st.progress(0)
     progress_text = st.empty()
     
-    # Create a dedicated container for screenshots
+    # Create a dedicated container for the live view
     st.markdown("### 🖼️ Live Browser Navigation")
     screenshot_container = st.empty()
     
-    # Store screenshots and captions
-    screenshots = []
-    captions = []
+    # Frames come from the DevTools screencast: pushed only on repaint, capped FPS, never written to disk
+    def show_frame(jpeg_bytes, info):
+        screenshot_container.image(jpeg_bytes, caption=f"Frame {info['frame']}: {info['url']}")
+        progress_text.text(f"Captured at: {time.strftime('%H:%M:%S')}")
+    
+    live_view = ScreencastView(show_frame)
     
     # First, launch Playwright directly to have more control
     async with async_playwright() as p:
-        # Launch browser (non-headless since we're using xvfb-run)
-        browser = await p.chromium.launch(headless=False)
+        # Screencast frames work in headless mode - no xvfb needed
+        browser = await p.chromium.launch(headless=True)
         context = await browser.new_context()
         page = await context.new_page()
         
@@ -56,90 +61,30 @@ async def run_agent_with_screenshots():
             use_vision=True
         )
         
-        # Function to take screenshots manually
-        async def take_screenshot(step_num, description):
-            try:
-                # Take screenshot with Playwright directly
-                screenshot_bytes = await page.screenshot()
-                
-                # Save screenshot to file
-                timestamp = int(time.time())
-                filename = f"screenshots/step_{step_num}_{timestamp}.png"
-                
-                with open(filename, "wb") as f:
-                    f.write(screenshot_bytes)
-                
-                # Add to collection
-                screenshots.append(filename)
-                captions.append(f"Step {step_num}: {description}")
-                
-                # Show current screenshot
-                with screenshot_container:
-                    st.image(screenshot_bytes, caption=f"Step {step_num}: {description}")
-                    st.text(f"Captured at: {time.strftime('%H:%M:%S')}")
-                
-                # Update progress
-                progress_bar.progress(step_num / 5)  # Assuming 5 steps max
-                progress_text.text(f"Step {step_num}/5: {description}")
-                
-            except Exception as e:
-                st.error(f"Screenshot error: {str(e)}")
-        
         try:
-            # Take initial screenshot
-            await take_screenshot(0, "Starting browser")
-            
-            # Start a background task to take screenshots periodically
-            async def screenshot_loop():
-                step = 1
-                while True:
-                    await asyncio.sleep(3)  # Take a screenshot every 3 seconds
-                    current_url = page.url
-                    await take_screenshot(step, f"URL: {current_url}")
-                    step += 1
-                    if step > 10:  # Limit to 10 screenshots
-                        break
+            await live_view.attach(page)
+            progress_bar.progress(10)
             
-            # Start the screenshot loop in the background
-            screenshot_task = asyncio.create_task(screenshot_loop())
-            
-            # Run the agent
-            result = await agent.run()
-            
-            # Cancel the screenshot task
-            screenshot_task.cancel()
-            
-            # Take final screenshot
-            await take_screenshot(99, "Task completed")
+            # Run the agent, following it into any tab it switches to
+            result = await agent.run(on_step_start=live_view.hook())
+            progress_bar.progress(100)
             
             # Display the result
             st.markdown("### 📋 Result")
             st.text(str(result))
+            st.caption(f"Live view: {live_view.stats()}")
             
-            # Display all screenshots
-            if screenshots:
-                st.markdown("### 🔍 All Screenshots")
-                
-                cols = st.columns(3)
-                for i, (screenshot_path, caption) in enumerate(zip(screenshots, captions)):
-                    try:
-                        with cols[i % 3]:
-                            with open(screenshot_path, "rb") as f:
-                                image_bytes = f.read()
-                            st.image(image_bytes, caption=caption, use_column_width=True)
-                    except Exception as e:
-                        st.warning(f"Could not load screenshot {screenshot_path}: {str(e)}")
-            
-            return result, screenshots, captions
+            return result, live_view.stats()
             
         finally:
+            await live_view.detach()
             # Close the browser
             await browser.close()
 
 # Main function
 if st.button("🚀 Run Browser-Use Agent", type="primary"):
     with st.spinner("🤖 AI Agent is working..."):
-        result, screenshots, captions = asyncio.run(run_agent_with_screenshots())
+        result, live_view_stats = asyncio.run(run_agent_with_screenshots())
         
         # Display completion message
         st.success("✅ Task completed successfully!")
@@ -150,7 +95,7 @@ st.markdown(
     """
     <div style='text-align: center; color: #666;'>
     📸 Browser-Use Screenshot Test | 
-    Using direct Playwright screenshot capture
+    Using DevTools screencast frames
     </div>
     """, 
     unsafe_allow_html=True
@@ -1,12 +1,14 @@
 import streamlit as st
-import subprocess
 import os
-import time
-import threading
-import asyncio
+import sys
 from dotenv import load_dotenv
 load_dotenv()
 
+# The streaming helpers live in the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live_output import LiveOutput
+from subprocess_stream import stream_to_live_output
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Subprocess Output Test", 
@@ -57,59 +59,22 @@ print_flush("✅ Test script completed successfully!")
 """)
     return script_path
 
-# Function to run a subprocess and stream its output to Streamlit
-def run_subprocess_with_output_streaming(output_area):
-    # Create the test script
-    script_path = create_test_script()
-    
+# Run a script as a subprocess and stream stdout and stderr to Streamlit as they are written
+def run_script_with_output_streaming(script_path, output_area):
+    live_output = LiveOutput(output_area)
     try:
-        # Run the script as a subprocess
-        process = subprocess.Popen(
-            ["python", script_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-        
-        # Initialize output collection
-        all_output = []
-        
-        # Stream output in real-time
-        while True:
-            # Read a line from stdout
-            output = process.stdout.readline()
-            
-            # If the process has finished and there's no more output, break
-            if output == '' and process.poll() is not None:
-                break
-            
-            # If there's output, display it
-            if output:
-                all_output.append(output.strip())
-                with output_area:
-                    st.code("\n".join(all_output))
-            
-            # Check for errors
-            error = process.stderr.readline()
-            if error:
-                all_output.append(f"ERROR: {error.strip()}")
-                with output_area:
-                    st.code("\n".join(all_output))
-        
-        # Get the return code
-        return_code = process.wait()
-        all_output.append(f"Process completed with return code: {return_code}")
-        
-        with output_area:
-            st.code("\n".join(all_output))
-            
+        # -u keeps the child's output unbuffered so lines arrive as they are printed
+        return_code = stream_to_live_output([sys.executable, "-u", script_path], live_output)
+        live_output.append(f"Process completed with return code: {return_code}\n")
     finally:
         # Clean up the temporary script
         if os.path.exists(script_path):
             os.remove(script_path)
 
+# Function to run a subprocess and stream its output to Streamlit
+def run_subprocess_with_output_streaming(output_area):
+    run_script_with_output_streaming(create_test_script(), output_area)
+
 # Function to run a browser-use test script
 def create_browser_use_script():
     script_path = "temp_browser_script.py"
@@ -157,56 +122,7 @@ if __name__ == "__main__":
     return script_path
 
 def run_browser_use_test(output_area):
-    # Create the browser-use test script
-    script_path = create_browser_use_script()
-    
-    try:
-        # Run the script as a subprocess
-        process = subprocess.Popen(
-            ["python", script_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-        
-        # Initialize output collection
-        all_output = []
-        
-        # Stream output in real-time
-        while True:
-            # Read a line from stdout
-            output = process.stdout.readline()
-            
-            # If the process has finished and there's no more output, break
-            if output == '' and process.poll() is not None:
-                break
-            
-            # If there's output, display it
-            if output:
-                all_output.append(output.strip())
-                with output_area:
-                    st.code("\n".join(all_output))
-            
-            # Check for errors
-            error = process.stderr.readline()
-            if error:
-                all_output.append(f"ERROR: {error.strip()}")
-                with output_area:
-                    st.code("\n".join(all_output))
-        
-        # Get the return code
-        return_code = process.wait()
-        all_output.append(f"Process completed with return code: {return_code}")
-        
-        with output_area:
-            st.code("\n".join(all_output))
-            
-    finally:
-        # Clean up the temporary script
-        if os.path.exists(script_path):
-            os.remove(script_path)
+    run_script_with_output_streaming(create_browser_use_script(), output_area)
 
 # Main UI
 col1, col2 = st.columns(2)
@@ -215,7 +131,7 @@ with col1:
     st.markdown("### Simple Output Test")
     if st.button("Run Simple Output Test", key="simple_test", use_container_width=True):
         # Create a container for output
-        output_area = st.empty()
+        output_area = st.container()
         
         with st.spinner("Running test script..."):
             run_subprocess_with_output_streaming(output_area)
@@ -226,7 +142,7 @@ with col2:
     st.markdown("### Browser-Use Test")
     if st.button("Run Browser-Use Test", key="browser_test", use_container_width=True):
         # Create a container for output
-        output_area = st.empty()
+        output_area = st.container()
         
         with st.spinner("Running browser-use test..."):
             run_browser_use_test(output_area)
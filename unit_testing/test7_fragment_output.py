@@ -1,5 +1,6 @@
 import streamlit as st
 import os
+import sys
 import time
 import threading
 import asyncio
@@ -7,6 +8,10 @@ import tempfile
 from dotenv import load_dotenv
 load_dotenv()
 
+# The live-output component lives in the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live_output import LiveOutput
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Fragment Output Test", 
@@ -71,6 +76,7 @@ if __name__ == "__main__":
 
 # Main UI
 col1, col2 = st.columns(2)
+browser_thread = None
 
 with col1:
     st.markdown("### Browser-Use Test with File Output")
@@ -84,30 +90,31 @@ with col1:
             pass
         
         # Start the browser-use process in a separate thread
-        thread = threading.Thread(target=run_browser_use_with_output_to_file)
-        thread.daemon = True
-        thread.start()
+        browser_thread = threading.Thread(target=run_browser_use_with_output_to_file)
+        browser_thread.daemon = True
+        browser_thread.start()
         
         st.success("✅ Browser-use test started! Output will appear below.")
 
 with col2:
     st.markdown("### Output Monitor")
     
-    # Use experimental fragment to update the output display
-    @st.experimental_fragment(run_every=0.5)
-    def display_output():
-        if os.path.exists(output_file):
-            try:
-                with open(output_file, "r") as f:
-                    content = f.read()
-                if content:
-                    st.code(content)
-                else:
-                    st.info("Waiting for output...")
-            except Exception as e:
-                st.error(f"Error reading output file: {e}")
-        else:
-            st.info("Output file not created yet...")
+    monitor_area = st.container()
+
+# Tail the output file while the run is active: each tick reads from the last byte offset
+# and sends only the newly appended lines to the browser
+if browser_thread is not None:
+    live_output = LiveOutput(monitor_area)
+    with monitor_area:
+        waiting = st.empty()
+        waiting.info("Waiting for output...")
+    while browser_thread.is_alive():
+        if live_output.update_from_file(output_file):
+            waiting.empty()
+        time.sleep(0.5)
+    live_output.update_from_file(output_file)
+    live_output.flush()
+    waiting.empty()
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,156 @@
+import os
+import re
+import json
+import string
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, quote
+
+import requests
+
+from detail_extractor import extract_detail_fields
+
+DETAIL_URL_TEMPLATES_FILE = "data/detail_url_templates.json"
+
+# Identifiers a detail URL can be built from, in the order they are tried when learning
+IDENTIFIER_NAMES = ["prop_id", "owner_id", "apn"]
+
+
+def current_tax_year():
+    return datetime.now().year
+
+
+def _is_year(value):
+    return bool(re.fullmatch(r"(19|20)\d{2}", value or ""))
+
+
+class DetailUrlTemplates:
+    """Per-CAD-domain detail URL templates learned from visited pages, e.g.
+    https://esearch.beecad.org/Property/View/{prop_id}?year={year}&ownerId={owner_id}"""
+
+    def __init__(self, templates_file=DETAIL_URL_TEMPLATES_FILE):
+        self.templates_file = templates_file
+        self.domains = {}
+        self.counties = {}
+
+        if os.path.exists(templates_file):
+            try:
+                with open(templates_file, 'r') as f:
+                    data = json.load(f)
+                self.domains = data.get("domains", {})
+                self.counties = data.get("counties", {})
+            except Exception as e:
+                print(f"Failed to load detail URL templates: {e}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.templates_file) or ".", exist_ok=True)
+        with open(self.templates_file, 'w') as f:
+            json.dump({"domains": self.domains, "counties": self.counties}, f, indent=2)
+
+    def learn(self, county, detail_url, identifiers):
+        """
+        Learn how a CAD builds detail URLs from one visited detail page
+        Args:
+            county: County the CAD serves (remembered so refreshes know which domain to use)
+            detail_url: URL of the detail page
+            identifiers: Known identifiers of the property shown, e.g. {"prop_id": "9763", "owner_id": "25544"}
+        Returns the learned template, or None if no identifier appears in the URL
+        """
+        parts = urlsplit(detail_url)
+        values = {value: name for name in reversed(IDENTIFIER_NAMES) if (value := identifiers.get(name))}
+
+        path = "/".join(
+            "{" + values[segment] + "}" if segment in values else segment
+            for segment in parts.path.split("/")
+        )
+
+        query = []
+        for key, value in parse_qsl(parts.query, keep_blank_values=True):
+            if key.lower() in ("year", "taxyear", "tax_year") or _is_year(value):
+                query.append(f"{key}={{year}}")
+            elif value in values:
+                query.append(f"{key}={{{values[value]}}}")
+            elif not value.isdigit():
+                # Constant parameters (e.g. "type=R") are part of the template;
+                # unknown numeric ones are per-property values we cannot fill in, so they are dropped
+                query.append(f"{key}={value}")
+
+        template = urlunsplit((parts.scheme, parts.netloc, path, "&".join(query), ""))
+        placeholders = self._placeholders(template) - {"year"}
+        if not placeholders:
+            return None
+
+        self.domains[parts.netloc] = {
+            "template": template,
+            "learned_at": datetime.now().isoformat(),
+            "example": detail_url
+        }
+        self.counties[county.lower()] = parts.netloc
+        self.save()
+        return template
+
+    def build(self, county, identifiers, year=None):
+        """Detail URL for a known property in the county's CAD, or None if it cannot be built"""
+        domain = self.counties.get(county.lower())
+        entry = self.domains.get(domain) if domain else None
+        if not entry:
+            return None
+
+        values = {name: quote(str(value), safe="") for name, value in identifiers.items() if value}
+        values["year"] = year or current_tax_year()
+
+        # Path placeholders are required; query parameters we have no value for are left out
+        parts = urlsplit(entry["template"])
+        if not self._placeholders(parts.path) <= values.keys():
+            return None
+        query = [
+            param for param in parts.query.split("&")
+            if param and self._placeholders(param) <= values.keys()
+        ]
+        template = urlunsplit((parts.scheme, parts.netloc, parts.path, "&".join(query), ""))
+        return template.format(**values)
+
+    def _placeholders(self, template):
+        return {field for _, field, _, _ in string.Formatter().parse(template) if field}
+
+
+def roll_year(url, year):
+    """Point a stored detail URL at another tax year"""
+    return re.sub(r"([?&](?:year|taxyear|tax_year)=)\d{4}", rf"\g<1>{year}", url, flags=re.IGNORECASE)
+
+
+def fetch_detail_fields(url, timeout=15):
+    """Fetch a detail page directly (no browser, no LLM) and extract its fields"""
+    response = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
+    response.raise_for_status()
+    return extract_detail_fields(html=response.text)
+
+
+def refresh_parcel(parcel, county, templates=None):
+    """
+    Re-read a known parcel's detail page with one direct request
+    Tries the current tax year first and falls back to last year's roll (new rolls
+    are published mid-year, so early in the year the current year may be empty).
+    Returns the extracted fields plus "detail_url", or None if no URL could be built or fetched.
+    """
+    templates = templates or DetailUrlTemplates()
+    identifiers = {name: parcel.get(name) for name in IDENTIFIER_NAMES}
+
+    year = current_tax_year()
+    for candidate_year in (year, year - 1):
+        url = templates.build(county, identifiers, candidate_year)
+        if url is None and parcel.get("detail_url"):
+            url = roll_year(parcel["detail_url"], candidate_year)
+        if url is None:
+            return None
+
+        try:
+            fields = fetch_detail_fields(url)
+        except Exception as e:
+            print(f"Direct detail fetch failed for {url}: {e}")
+            continue
+
+        # An empty page for this year, or a page for some other property, is not a refresh
+        if fields.get("apn_number") and fields["apn_number"] in (parcel.get("apn"), parcel.get("apn_number")):
+            fields["detail_url"] = url
+            return fields
+    return None
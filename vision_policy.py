@@ -0,0 +1,114 @@
+import os
+import json
+from datetime import datetime
+
+# Error fragments browser-use reports when the agent targets an element that isn't there
+ELEMENT_NOT_FOUND_MARKERS = [
+    "does not exist",
+    "not found in selector map",
+    "not found or not visible",
+]
+
+VISION_USAGE_FILE = "logs/vision_usage.json"
+
+
+class VisionPolicy:
+    """Per-step vision switch: run on DOM text and only send a screenshot when the agent is stuck"""
+
+    def __init__(self, county, same_url_window=3):
+        self.county = county
+        # Number of consecutive steps on one URL that counts as "no progress"
+        self.same_url_window = same_url_window
+        self.vision_steps = {}
+        self.total_steps = {}
+        # Whether the step currently running was given a screenshot
+        self.vision_active = False
+
+    def hook(self, label):
+        """Return an on_step_start hook for Agent.run() that records steps under the given label"""
+        self.vision_steps.setdefault(label, [])
+        self.total_steps.setdefault(label, 0)
+
+        async def on_step_start(agent):
+            history = agent.state.history.history
+            reason = self.stuck_reason(history)
+
+            # Vision only for this step - the next step is evaluated again from scratch
+            self.vision_active = reason is not None
+            agent.settings.use_vision = self.vision_active
+            self.total_steps[label] += 1
+            if reason:
+                self.vision_steps[label].append({
+                    "step": agent.state.n_steps,
+                    "reason": reason,
+                    "url": history[-1].state.url if history else None
+                })
+
+        return on_step_start
+
+    def stuck_reason(self, history):
+        """Return why the agent looks stuck (or None) based on the steps taken so far"""
+        if not history:
+            return None
+
+        # 1. The last action targeted an element that does not exist
+        for action_result in history[-1].result:
+            error = (action_result.error or "").lower()
+            if any(marker in error for marker in ELEMENT_NOT_FOUND_MARKERS):
+                return "element_not_found"
+
+        # 2. The model repeated exactly the same actions twice in a row
+        if len(history) >= 2:
+            last_actions = self._actions(history[-1])
+            if last_actions and last_actions == self._actions(history[-2]):
+                return "repeated_actions"
+
+        # 3. The page has not changed for several steps
+        if len(history) >= self.same_url_window:
+            recent_urls = {item.state.url for item in history[-self.same_url_window:]}
+            if len(recent_urls) == 1:
+                return "no_progress"
+
+        return None
+
+    def _actions(self, history_item):
+        """Serialize the actions of a history item so two steps can be compared"""
+        if not history_item.model_output:
+            return None
+        return [action.model_dump(exclude_unset=True) for action in history_item.model_output.action]
+
+    def summary(self):
+        """Summarize which steps needed vision for this lookup"""
+        return {
+            label: {
+                "total_steps": self.total_steps.get(label, 0),
+                "vision_steps": steps
+            }
+            for label, steps in self.vision_steps.items()
+        }
+
+    def save_usage(self, usage_file=VISION_USAGE_FILE):
+        """Append this lookup's vision usage to the per-county usage log"""
+        os.makedirs(os.path.dirname(usage_file), exist_ok=True)
+
+        try:
+            if os.path.exists(usage_file):
+                with open(usage_file, 'r') as f:
+                    usage = json.load(f)
+            else:
+                usage = {}
+
+            county_runs = usage.setdefault(self.county, [])
+            county_runs.append({
+                "timestamp": datetime.now().isoformat(),
+                "agents": self.summary()
+            })
+
+            # Keep only the last 50 lookups per county
+            usage[self.county] = county_runs[-50:]
+
+            with open(usage_file, 'w') as f:
+                json.dump(usage, f, indent=2)
+
+        except Exception as e:
+            print(f"Failed to save vision usage: {e}")